@@ -0,0 +1,42 @@
+""" Splash damage and freezing. Area hits landing on one tick are collected and resolved together,
+one distance mask of all the hits against all walking enemies"""
+import numpy as np
+
+from ai.enemy_motion import EnemyMotion
+from game_objects.entity_store import EntityStore
+
+
+class AreaEffects:
+    """ Area hits of the current tick. Positions are in enemy position space (top left of the enemy rect)"""
+
+    def __init__(self, store:EntityStore) -> None:
+        self.store = store
+        self.events = [] # (x, y, radius, damage, freeze ticks)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, x:float, y:float, radius:float, damage:float, freeze:float) -> None:
+        self.events.append((x, y, radius, damage, freeze))
+
+    def resolve(self, motion:EnemyMotion) -> None:
+        """ Applies the damage and freezes of all collected hits. Damage of overlapping hits adds up, the longest freeze wins"""
+        if not self.events:
+            return
+        events = np.array(self.events, dtype=np.float64)
+        self.events = []
+        columns = self.store.columns
+        rows = np.flatnonzero(columns["moving"])
+        if not rows.size:
+            return
+
+        # One row per hit, one column per enemy
+        dx = columns["x"][rows] - events[:, 0:1]
+        dy = columns["y"][rows] - events[:, 1:2]
+        inside = dx*dx + dy*dy <= events[:, 2:3]**2
+
+        columns["hp"][rows] -= events[:, 3] @ inside
+        freeze = np.where(inside, events[:, 4:5], 0.).max(axis=0)
+        frozen = freeze > 0
+        if frozen.any():
+            motion.freeze(rows[frozen], freeze[frozen])
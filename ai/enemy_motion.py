@@ -0,0 +1,92 @@
+""" Batched enemy movement along the routes"""
+import numpy as np
+
+from ai.path_graph import Route
+from config.settings.general_config import Game
+from game_objects.entity_store import EntityStore
+
+
+class EnemyMotion:
+    """ Moves all walking enemies at once, working directly on the columns of the enemy store"""
+
+    def __init__(self, routes:list[Route], store:EntityStore) -> None:
+        self.routes = routes
+        self.route_lengths = np.array([route.length for route in routes], dtype=np.float64)
+        self.store = store
+
+    def add(self, enemy, route_id:int, speed:float) -> None:
+        """ Puts enemy on the start of the route"""
+        row = enemy.entity.row
+        columns = self.store.columns
+        columns["distance"][row] = 0.
+        columns["speed"][row] = columns["walk_speed"][row] = speed
+        columns["frozen"][row] = columns["immune"][row] = 0.
+        columns["route_id"][row] = route_id
+        columns["x"][row], columns["y"][row] = self.routes[route_id].waypoints[0]
+        columns["previous_x"][row], columns["previous_y"][row] = self.routes[route_id].waypoints[0]
+        columns["moving"][row] = True
+
+    def remove(self, enemy) -> None:
+        """ Stops moving the enemy"""
+        self.store.columns["moving"][enemy.entity.row] = False
+
+    def freeze(self, rows:np.ndarray, ticks:np.ndarray) -> None:
+        """ Stops the enemies in rows for ticks. Enemies already frozen or still immune after their last freeze are
+        left alone, so towers reloading faster than the freeze lasts can not hold anyone forever"""
+        columns = self.store.columns
+        free = (columns["frozen"][rows] <= 0) & (columns["immune"][rows] <= 0)
+        rows = rows[free]
+        columns["frozen"][rows] = ticks[free]
+        columns["speed"][rows] = 0.
+
+    def thaw(self) -> None:
+        """ Counts the freezes and immunities down, enemies whose freeze ran out walk again and are immune for a while"""
+        columns = self.store.columns
+        frozen = columns["frozen"]
+        immune = columns["immune"]
+        moving = columns["moving"]
+        thawing = moving & (frozen > 0)
+        recovering = moving & (immune > 0)
+        if not (thawing.any() or recovering.any()):
+            return
+        immune[recovering] -= 1
+        frozen[thawing] -= 1
+        thawed = thawing & (frozen <= 0)
+        columns["speed"][thawed] = columns["walk_speed"][thawed]
+        immune[thawed] = Game.FREEZE_IMMUNITY*Game.TICK_RATE
+
+    def step(self) -> list:
+        """ Moves all walking enemies by their speed. Returns enemies that reached the end, they stop moving"""
+        self.thaw()
+        columns = self.store.columns
+        moving = columns["moving"]
+        distance = columns["distance"]
+        route_ids = columns["route_id"]
+        distance[moving] += columns["speed"][moving]
+
+        finished = moving & (distance >= self.route_lengths[route_ids])
+        moving[finished] = False
+        finished_enemies = list(self.store.objects[finished])
+
+        for route_id, route in enumerate(self.routes):
+            rows = np.flatnonzero(moving & (route_ids == route_id))
+            if not rows.size:
+                continue
+            travelled = distance[rows]
+            segment = np.searchsorted(route.lengths, travelled, side="right") - 1
+            segment = np.clip(segment, 0, len(route.lengths)-2)
+            start = route.waypoints[segment]
+            end = route.waypoints[segment+1]
+            part = (travelled - route.lengths[segment]) / (route.lengths[segment+1] - route.lengths[segment])
+            columns["x"][rows] = start[:, 0] + (end[:, 0]-start[:, 0])*part
+            columns["y"][rows] = start[:, 1] + (end[:, 1]-start[:, 1])*part
+
+        return finished_enemies
+
+    def write_back(self) -> None:
+        """ Copies positions to the rects of walking enemies, the only ones that get drawn"""
+        columns = self.store.columns
+        rows = np.flatnonzero(columns["moving"])
+        for enemy, x, y in zip(self.store.objects[rows], columns["x"][rows].tolist(), columns["y"][rows].tolist()):
+            enemy.rect.x = x
+            enemy.rect.y = y
@@ -0,0 +1,81 @@
+""" Where and when a shot meets an enemy walking its route. Hits are solved once when the tower fires
+and kept in a queue ordered by the tick they land on, nothing flies tick by tick"""
+import heapq
+import itertools
+import math
+
+from ai.path_graph import Route
+
+
+def first_root(a:float, b:float, c:float, low:float, high:float) -> float:
+    """ Smallest root of a*u**2 + b*u + c in [low, high], None when there is none"""
+    if abs(a) < 1e-12:
+        if abs(b) < 1e-12:
+            return None
+        roots = (-c / b,)
+    else:
+        discriminant = b*b - 4*a*c
+        if discriminant < 0:
+            return None
+        root = math.sqrt(discriminant)
+        roots = sorted(((-b - root) / (2*a), (-b + root) / (2*a)))
+    for u in roots:
+        if low <= u <= high:
+            return u
+    return None
+
+
+def intercept(route:Route, distance:float, speed:float, offset:tuple, origin:tuple, shot_speed:float) -> tuple:
+    """ Solves when a shot from origin flying shot_speed pixels per tick meets an enemy that is distance along the route
+    and walks speed pixels per tick. offset is added to route positions (center of the enemy).
+    Returns (ticks, (x, y)) of the hit, None when the enemy reaches the end first"""
+    offset_x, offset_y = offset
+    origin_x, origin_y = origin
+    segment = route.advance(distance, 0)
+    x, y = route.position(distance, segment)
+    x, y = x + offset_x, y + offset_y
+    if speed <= 0 or len(route.waypoints) == 1:
+        return math.hypot(x-origin_x, y-origin_y) / shot_speed, (x, y)
+
+    elapsed = 0. # Ticks until the enemy is at x, y
+    for segment in range(segment, len(route.lengths)-1):
+        duration = (route.lengths[segment+1] - max(distance, route.lengths[segment])) / speed
+        next_x, next_y = route.waypoints[segment+1]
+        next_x, next_y = next_x + offset_x, next_y + offset_y
+        if duration > 0:
+            # Enemy is at x + velocity*u, the shot has flown shot_speed*(elapsed + u) by then
+            velocity_x, velocity_y = (next_x-x) / duration, (next_y-y) / duration
+            dx, dy = x - origin_x, y - origin_y
+            u = first_root(velocity_x**2 + velocity_y**2 - shot_speed**2,
+                           2*(dx*velocity_x + dy*velocity_y - shot_speed**2 * elapsed),
+                           dx*dx + dy*dy - (shot_speed*elapsed)**2,
+                           0., duration)
+            if u is not None:
+                return elapsed + u, (x + velocity_x*u, y + velocity_y*u)
+            elapsed += duration
+        x, y = next_x, next_y
+    return None
+
+
+class HitQueue:
+    """ Shots in flight ordered by the tick they land on"""
+
+    def __init__(self) -> None:
+        self.heap = []
+        self.order = itertools.count() # Ties keep the firing order, shots are never compared
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def schedule(self, tick:int, tower, target, point:tuple, projectile=None) -> None:
+        """ Shot of the tower landing on point on tick. target is the enemy it was aimed at, projectile the visible shot or None"""
+        heapq.heappush(self.heap, (tick, next(self.order), tower, target, point, projectile))
+
+    def due(self, tick:int):
+        """ Yields (tower, target, point, projectile) of every shot landing on tick or earlier"""
+        heap = self.heap
+        while heap and heap[0][0] <= tick:
+            yield heapq.heappop(heap)[2:]
+
+    def clear(self) -> None:
+        self.heap = []
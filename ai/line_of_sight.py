@@ -0,0 +1,66 @@
+""" Which path tiles a tower can shoot at. Rays from the tower to every path tile in range are walked over the wall grid
+once, the result is kept per tower as a bitmap of the map cells"""
+import numpy as np
+
+from config.settings.general_config import Window
+from game_objects.tiles.tile_grid import TileGrid
+from game_objects.tiles.tile_type import TileType
+
+
+class LineOfSight:
+    """ Visibility cache. Walls only change when a map is shown and towers do not block shots,
+    so a bitmap stays valid until clear is called and a new tower only computes its own"""
+
+    def __init__(self, tile_grid:TileGrid) -> None:
+        self.tile_grid = tile_grid
+        self.path = np.empty((0, 2), dtype=np.int64) # Tile coordinates of the tiles enemies walk on
+        self.bitmaps = {} # tower -> bytes, 1 for every visible cell
+        self.rays = 0 # Rays walked, for profiling
+
+    def watch(self, tiles) -> None:
+        """ Sets the path tiles (tile coordinates) the towers look at"""
+        self.path = np.array(sorted(tiles), dtype=np.int64).reshape(-1, 2)
+        self.clear()
+
+    def clear(self) -> None:
+        """ Forgets every bitmap, call when walls change"""
+        self.bitmaps = {}
+
+    def forget(self, tower) -> None:
+        self.bitmaps.pop(tower, None)
+
+    def compute(self, tower) -> bytes:
+        """ Bitmap of the path cells within range of the tower that no wall hides"""
+        grid = self.tile_grid
+        size = Window.PIXEL_SIZE
+        bitmap = np.zeros(grid.width*grid.height, dtype=bool)
+        x, y = tower.rect.center
+        centers = (self.path + 0.5) * size
+        # One tile more than the range, an enemy between two tiles is still in range
+        reach = tower.range + size
+        near = self.path[(centers[:, 0]-x)**2 + (centers[:, 1]-y)**2 <= reach**2]
+        types = grid.types
+        for tile_x, tile_y in near.tolist():
+            self.rays += 1
+            cells = grid.cells_on_line(x, y, (tile_x+0.5)*size, (tile_y+0.5)*size)
+            if all(types[index] != TileType.WALL for index in cells):
+                bitmap[tile_y*grid.width + tile_x] = True
+        return bitmap.tobytes()
+
+    def bitmap(self, tower) -> bytes:
+        bitmap = self.bitmaps.get(tower)
+        if bitmap is None:
+            bitmap = self.bitmaps[tower] = self.compute(tower)
+        return bitmap
+
+    def sees(self, tower, x:float, y:float) -> bool:
+        """ Whether the tower can shoot at the pixel position"""
+        index = self.tile_grid.cell(int(x), int(y))
+        return index != -1 and self.bitmap(tower)[index] == 1
+
+    def visible(self, tower, enemies) -> list:
+        """ Enemies the tower can shoot at. They have to be on the map, which enemies walking the path are"""
+        bitmap = self.bitmap(tower)
+        size = Window.PIXEL_SIZE
+        width = self.tile_grid.width
+        return [enemy for enemy in enemies if bitmap[enemy.rect.centery//size*width + enemy.rect.centerx//size]]
@@ -0,0 +1,97 @@
+""" Graph of the path tiles and the routes enemies walk along"""
+from collections import deque
+
+import numpy as np
+
+from config.settings.general_config import Window
+from level_converter.level_converter import ConvertedLevel
+
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class Route:
+    """ One way from start to end stored as turning points plus cumulative arc length in pixels"""
+
+    def __init__(self, tiles:list[tuple[int, int]]) -> None:
+        points = [tiles[0]]
+        for previous, tile, following in zip(tiles, tiles[1:], tiles[2:]):
+            # Keep only the tiles where the direction changes
+            if (tile[0]-previous[0], tile[1]-previous[1]) != (following[0]-tile[0], following[1]-tile[1]):
+                points.append(tile)
+        if len(tiles) > 1:
+            points.append(tiles[-1])
+
+        self.tiles = tiles
+        self.waypoints = np.array(points, dtype=np.float64) * Window.PIXEL_SIZE
+        segments = np.abs(np.diff(self.waypoints, axis=0)).sum(axis=1)
+        self.lengths = np.concatenate(([0.], np.cumsum(segments)))
+        self.length = float(self.lengths[-1])
+
+    def advance(self, distance:float, segment:int) -> int:
+        """ Returns index of the segment containing distance, searching forward from segment"""
+        last = len(self.lengths) - 2
+        while segment < last and self.lengths[segment+1] <= distance:
+            segment += 1
+        return segment
+
+    def position(self, distance:float, segment:int) -> tuple[float, float]:
+        """ Returns pixel position distance along the route. segment has to contain distance"""
+        if len(self.waypoints) == 1:
+            return tuple(self.waypoints[0])
+        x, y = self.waypoints[segment]
+        next_x, next_y = self.waypoints[segment+1]
+        travelled = min(distance, self.length) - self.lengths[segment]
+        segment_length = self.lengths[segment+1] - self.lengths[segment]
+        return x + (next_x-x)*travelled/segment_length, y + (next_y-y)*travelled/segment_length
+
+
+class PathGraph:
+    """ Adjacency of the path tiles keyed by tile coordinates"""
+
+    def __init__(self, level:ConvertedLevel) -> None:
+        size = Window.PIXEL_SIZE
+        self.start = tuple(level.coords("start")[0] // size)
+        self.end = tuple(level.coords("end")[0] // size)
+
+        tiles = set(map(tuple, (level.coords("path") // size).tolist()))
+        tiles.add(self.start)
+        tiles.add(self.end)
+
+        self.adjacency = {}
+        for x, y in tiles:
+            self.adjacency[(x, y)] = [(x+dx, y+dy) for dx, dy in NEIGHBOURS if (x+dx, y+dy) in tiles]
+
+    def distances_to_end(self) -> dict:
+        """ Breadth first search from the end. Returns number of steps to the end for every reachable tile"""
+        distances = {self.end: 0}
+        queue = deque([self.end])
+        while queue:
+            tile = queue.popleft()
+            for neighbour in self.adjacency[tile]:
+                if neighbour not in distances:
+                    distances[neighbour] = distances[tile] + 1
+                    queue.append(neighbour)
+        return distances
+
+    def routes(self, max_routes:int=8) -> list[Route]:
+        """ Returns the shortest routes from start to end. Every fork on a shortest way creates a new route"""
+        distances = self.distances_to_end()
+        if self.start not in distances:
+            return []
+
+        routes = []
+        # Forks waiting to be walked: (route they branch from, length of the shared part, first tile of the branch)
+        forks = [([], 0, self.start)]
+        while forks and len(routes) < max_routes:
+            parent, shared, tile = forks.pop()
+            tiles = parent[:shared]
+            tiles.append(tile)
+            while tile != self.end:
+                steps = [n for n in self.adjacency[tile] if distances.get(n) == distances[tile]-1]
+                for fork in steps[1:]:
+                    if len(routes) + len(forks) + 1 < max_routes:
+                        forks.append((tiles, len(tiles), fork))
+                tile = steps[0]
+                tiles.append(tile)
+            routes.append(Route(tiles))
+        return routes
@@ -0,0 +1,110 @@
+from pygame import Rect
+from pygame.sprite import Sprite
+
+from config.settings.general_config import Window
+
+
+class SpatialGrid:
+    """ Uniform grid that buckets sprites by position. Rebuilt every frame, answers proximity queries"""
+
+    def __init__(self, cell_size:int=Window.PIXEL_SIZE*4, width:int=Window.GAME_WIDTH, height:int=Window.GAME_HEIGHT) -> None:
+        self.cell_size = cell_size
+        self.columns = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.cells = [[] for _ in range(self.columns*self.rows)]
+        self.filled = [] # Indices of the cells holding something, only those are cleared
+        self.count = 0
+
+    def cell_coords(self, x:float, y:float) -> tuple[int, int]:
+        """ Returns column and row of the cell under position. Positions outside the map fall into the border cells"""
+        column = min(max(int(x) // self.cell_size, 0), self.columns-1)
+        row = min(max(int(y) // self.cell_size, 0), self.rows-1)
+        return column, row
+
+    def clear(self) -> None:
+        cells = self.cells
+        for index in self.filled:
+            cells[index].clear()
+        self.filled = []
+        self.count = 0
+
+    def insert(self, sprite:Sprite) -> None:
+        """ Puts sprite into every cell its rect overlaps"""
+        rect = sprite.rect
+        left, top = self.cell_coords(rect.left, rect.top)
+        right, bottom = self.cell_coords(rect.right-1, rect.bottom-1)
+        for row in range(top, bottom+1):
+            for column in range(left, right+1):
+                cell = self.cells[row*self.columns + column]
+                if not cell:
+                    self.filled.append(row*self.columns + column)
+                cell.append(sprite)
+        self.count += 1
+
+    def rebuild(self, sprites) -> None:
+        """ Replaces the content of the grid"""
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def _ring(self, column:int, row:int, radius:int):
+        """ Yields cells exactly radius cells away from column, row"""
+        for ring_row in range(row-radius, row+radius+1):
+            if not 0 <= ring_row < self.rows:
+                continue
+            if ring_row in (row-radius, row+radius):
+                columns = range(column-radius, column+radius+1)
+            else:
+                columns = (column-radius, column+radius)
+            for ring_column in columns:
+                if 0 <= ring_column < self.columns:
+                    yield self.cells[ring_row*self.columns + ring_column]
+
+    def nearest(self, x:float, y:float, max_distance:float=None, condition=None) -> Sprite:
+        """ Returns sprite with rect center closest to x, y or None"""
+        column, row = self.cell_coords(x, y)
+        best = None
+        best_distance = float("inf") if max_distance is None else max_distance**2
+        for radius in range(max(self.columns, self.rows)):
+            # Every sprite in this ring is at least (radius-1) cells away
+            if radius > 1 and ((radius-1)*self.cell_size)**2 > best_distance:
+                break
+            for cell in self._ring(column, row, radius):
+                for sprite in cell:
+                    if condition and not condition(sprite):
+                        continue
+                    center_x, center_y = sprite.rect.center
+                    distance = (center_x-x)**2 + (center_y-y)**2
+                    if distance < best_distance:
+                        best_distance = distance
+                        best = sprite
+        return best
+
+    def in_range(self, x:float, y:float, radius:float) -> list[Sprite]:
+        """ Returns sprites with rect center within radius of x, y"""
+        left, top = self.cell_coords(x-radius, y-radius)
+        right, bottom = self.cell_coords(x+radius, y+radius)
+        found = set()
+        result = []
+        for row in range(top, bottom+1):
+            for column in range(left, right+1):
+                for sprite in self.cells[row*self.columns + column]:
+                    if sprite in found:
+                        continue
+                    center_x, center_y = sprite.rect.center
+                    if (center_x-x)**2 + (center_y-y)**2 <= radius**2:
+                        found.add(sprite)
+                        result.append(sprite)
+        return result
+
+    def colliding(self, rect:Rect) -> list[Sprite]:
+        """ Returns sprites whose rect collides with rect"""
+        left, top = self.cell_coords(rect.left, rect.top)
+        right, bottom = self.cell_coords(rect.right-1, rect.bottom-1)
+        found = []
+        for row in range(top, bottom+1):
+            for column in range(left, right+1):
+                for sprite in self.cells[row*self.columns + column]:
+                    if sprite not in found and rect.colliderect(sprite.rect):
+                        found.append(sprite)
+        return found
@@ -0,0 +1,58 @@
+""" Target selection for towers. Every tower keeps its target until it dies, leaves range or the tower stops seeing it,
+only then a new one is searched among the enemies in range"""
+from functools import partial
+
+from ai.line_of_sight import LineOfSight
+from ai.spatial_grid import SpatialGrid
+from config.enums.targeting_policy import TargetingPolicy
+from config.enums.towers_ability import Ability
+
+
+def distance_squared(tower, enemy) -> float:
+    tower_x, tower_y = tower.rect.center
+    enemy_x, enemy_y = enemy.rect.center
+    return (enemy_x-tower_x)**2 + (enemy_y-tower_y)**2
+
+# Score of a candidate for every policy, the highest score is targeted
+POLICIES = {
+    TargetingPolicy.FIRST: lambda tower, enemy: enemy.distance,
+    TargetingPolicy.LAST: lambda tower, enemy: -enemy.distance,
+    TargetingPolicy.STRONGEST: lambda tower, enemy: enemy.hp,
+    TargetingPolicy.CLOSEST: lambda tower, enemy: -distance_squared(tower, enemy),
+}
+
+
+class Targeting:
+    """ Keeps a target for every tower, candidates come from the spatial grid of the enemies"""
+
+    def __init__(self, enemy_grid:SpatialGrid, line_of_sight:LineOfSight) -> None:
+        self.enemy_grid = enemy_grid
+        self.line_of_sight = line_of_sight
+        self.searches = 0 # How many times a target was searched, for profiling
+
+    def sees(self, tower, enemy) -> bool:
+        """ Camouflaged enemies are seen only by towers destroying camouflage"""
+        return enemy.detectable or tower.tower_type.ABILITY == Ability.DESTROYS_CAMOUFLAGE
+
+    def keeps(self, tower) -> bool:
+        """ Whether the current target of the tower is still valid. Walls can hide it as it walks"""
+        target = tower.target
+        return (target is not None and target.alive() and distance_squared(tower, target) <= tower.range**2
+                and self.line_of_sight.sees(tower, *target.rect.center))
+
+    def acquire(self, tower) -> None:
+        """ Picks the best enemy in range and in sight by the policy of the tower, None when there is none"""
+        self.searches += 1
+        x, y = tower.rect.center
+        in_sight = self.line_of_sight.visible(tower, self.enemy_grid.in_range(x, y, tower.range))
+        candidates = [enemy for enemy in in_sight if self.sees(tower, enemy)]
+        if candidates:
+            tower.target = max(candidates, key=partial(POLICIES[tower.targeting], tower))
+        else:
+            tower.target = None
+
+    def update(self, towers) -> None:
+        """ Revalidates the target of every tower, searching only for towers that lost it"""
+        for tower in towers:
+            if not self.keeps(tower):
+                self.acquire(tower)
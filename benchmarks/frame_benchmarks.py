@@ -0,0 +1,320 @@
+""" Benchmarks of the per-frame hot paths. Every function is timed alone on synthetic states of growing size,
+the results are scaling curves that can be saved as JSON baselines and compared.
+
+    python -m benchmarks.frame_benchmarks --save baseline.json
+    python -m benchmarks.frame_benchmarks --compare baseline.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+import numpy as np
+import pygame as pg
+
+from benchmarks.scenario import BENCHMARK_SEED, TOWER_SIZE, build_state, create_enemies
+from config.settings.general_config import Game, Window
+from config.settings.towers import Basic, Cannon, Yeti
+from game_objects.entity_store import detach
+from graphics_manager.graphics_manager import GraphicsManager
+from level_converter.level_converter import convert_level
+from level_generator.level_generator import generate_level
+from level_store.level_store import LevelStore
+
+ENEMY_COUNTS = [250, 1000, 4000]
+TOWER_COUNTS = [8, 24, 64] # About 70 towers fit on the benchmark map
+PROJECTILE_COUNTS = [100, 400, 1600]
+SPLASH_COUNTS = [10, 40, 160]
+LEVELS = [0, 2, 5]
+SUPERLINEAR = 1.5 # Growth exponent above which a curve is reported as suspicious
+MIN_LOOP_TIME = 0.2 # Seconds every timing loop runs, timeit.Timer.autorange aims at the same
+
+
+# Every benchmark takes its size and returns the function to time. Building the state is not timed.
+# Benchmarks changing their state return (function, reset) instead, reset puts the state back before every call
+
+def bench_enemy_update(enemies:int):
+    game = build_state(enemies=enemies)
+    distance = game.enemy_store.columns["distance"]
+    start = distance.copy()
+    def reset():
+        # Nobody reaches the end, every call moves the same enemies
+        distance[:] = start
+    return game.enemy_update, reset
+
+def bench_spawn_enemy(waiting:int):
+    game = build_state()
+    game.not_spawned_enemies = create_enemies(game, waiting)
+    def reset():
+        # The enemy spawned by the last call waits again
+        for enemy in game.living_enemies.sprites():
+            game.living_enemies.remove(enemy)
+            game.moving_objects.remove(enemy)
+            game.ai.remove_enemy(enemy)
+            game.not_spawned_enemies.append(enemy)
+    return lambda: game.spawn_enemy(1), reset
+
+def bench_shoot(towers:int):
+    game = build_state(enemies=1000, towers=towers)
+    game.ticks = 0
+    def reset():
+        # Every tower searches a target and fires
+        for tower in game.towers:
+            tower.target = None
+            tower.last_fired = -np.inf
+        game.hits.clear()
+    return game.shoot, reset
+
+def bench_update_projectiles(projectiles:int):
+    game = build_state(enemies=500, towers=10, projectiles=projectiles)
+    game.ticks = 10**6 # Every shot lands
+    heap = list(game.hits.heap)
+    hp = game.enemy_store.columns["hp"]
+    start = hp.copy()
+    def reset():
+        game.hits.heap = list(heap)
+        hp[:] = start
+    return game.update_projectiles, reset
+
+def bench_fire(projectiles:int):
+    game = build_state(enemies=500, towers=10)
+    towers = list(game.towers)
+    enemies = list(game.living_enemies)
+    def fire():
+        for index in range(projectiles):
+            tower = towers[index % len(towers)]
+            tower.target = enemies[index % len(enemies)]
+            game.fire(tower)
+    return fire, game.hits.clear
+
+def bench_area_effects(splashes:int):
+    game = build_state(enemies=1000)
+    rng = random.Random(0)
+    events = [(rng.randrange(Window.GAME_WIDTH), rng.randrange(Window.GAME_HEIGHT), Cannon.SPLASH_RADIUS*Game.RANGE_UNIT,
+               Cannon.DAMAGE, Yeti.FREEZE_TIME*Game.TICK_RATE) for _ in range(splashes)]
+    columns = game.enemy_store.columns
+    start = {name: columns[name].copy() for name in ("hp", "speed", "frozen", "immune")}
+    def reset():
+        game.area_effects.events = list(events)
+        for name, column in start.items():
+            columns[name][:] = column
+    return lambda: game.area_effects.resolve(game.ai.motion), reset
+
+def bench_buy_tower(towers:int):
+    game = build_state(towers=towers)
+    height, width = game.converted_level.grid.shape
+    size = Window.PIXEL_SIZE
+    places = [(x, y) for y in range(0, height*size - TOWER_SIZE, size) for x in range(0, width*size - TOWER_SIZE, size)
+              if game.tile_grid.can_place(x, y, TOWER_SIZE, TOWER_SIZE)]
+    grid = game.tile_grid
+    types, cells, built = list(grid.types), list(grid.towers), set(game.towers)
+    tiles = [(tile, tile.type) for tile in game.tiles]
+    def reset():
+        # The tower bought by the last call is taken away again
+        for tower in game.towers.sprites():
+            if tower not in built:
+                tower.kill()
+                game.line_of_sight.forget(tower)
+                detach(tower)
+        grid.types[:] = types
+        grid.towers[:] = cells
+        for tile, tile_type in tiles:
+            if tile.type != tile_type:
+                tile.type = tile_type
+                game.occupied_tiles.remove(tile)
+                game.default_tiles.add(tile)
+        game.coins = Basic.COST
+    return lambda: game.buy_tower(Basic, places[len(places)//2]), reset
+
+def bench_convert_level(level:int):
+    grid = LevelStore().get(level, BENCHMARK_SEED).grid
+    return lambda: convert_level(level, grid)
+
+def bench_generate_level(level:int):
+    return lambda: generate_level(level, seed=BENCHMARK_SEED)
+
+GRAPHICS = {}
+
+def bench_load_all_textures(_:int):
+    if "manager" not in GRAPHICS:
+        GRAPHICS["manager"] = GraphicsManager()
+        GRAPHICS["manager"].init_graphics()
+    return GRAPHICS["manager"].load_all_textures
+
+# name: (function, sizes, what the size is, whether a scaling curve makes sense)
+BENCHMARKS = {
+    "enemy_update": (bench_enemy_update, ENEMY_COUNTS, "enemies", True),
+    "spawn_enemy": (bench_spawn_enemy, ENEMY_COUNTS, "waiting enemies", True),
+    "shoot": (bench_shoot, TOWER_COUNTS, "towers", True),
+    "update_projectiles": (bench_update_projectiles, PROJECTILE_COUNTS, "projectiles", True),
+    "fire": (bench_fire, PROJECTILE_COUNTS, "shots", True),
+    "area_effects": (bench_area_effects, SPLASH_COUNTS, "splashes", True),
+    "buy_tower": (bench_buy_tower, TOWER_COUNTS, "towers", True),
+    "convert_level": (bench_convert_level, LEVELS, "level", False),
+    "generate_level": (bench_generate_level, LEVELS, "level", False),
+    "load_all_textures": (bench_load_all_textures, [1], "", False),
+}
+
+
+def time_loop(function, reset) -> float:
+    """ Seconds of one call, averaged over calls until they took MIN_LOOP_TIME. Resets run before every call, untimed"""
+    elapsed, calls = 0, 0
+    collecting = gc.isenabled()
+    gc.disable() # Like timeit, collections would land in random calls
+    try:
+        while elapsed < MIN_LOOP_TIME*1e9:
+            reset()
+            start = time.perf_counter_ns()
+            function()
+            elapsed += time.perf_counter_ns() - start
+            calls += 1
+    finally:
+        if collecting:
+            gc.enable()
+    return elapsed / calls / 1e9
+
+
+REFERENCE_VALUES = np.arange(1024, dtype=np.float64)
+
+def reference_work() -> float:
+    """ Fixed mix of Python and small NumPy work. The machine speed is judged by it, shared machines change
+    their speed by tens of percent from minute to minute"""
+    total = 0
+    for index in range(256):
+        total += index*index
+    return total + float(np.sqrt(REFERENCE_VALUES).sum())
+
+
+def measure(setup, size:int, repeat:int) -> tuple[float, float]:
+    """ Milliseconds of one call and of one reference_work call, the fastest of repeat timing loops each.
+    Every loop runs at least MIN_LOOP_TIME, reference loops take turns with the benchmark ones so both see the same machine"""
+    bench = setup(size)
+    function, reset = bench if isinstance(bench, tuple) else (bench, None)
+    reference = timeit.Timer(reference_work)
+    reference_number, _ = reference.autorange()
+    if reset is None:
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange() # Enough calls for MIN_LOOP_TIME
+        loop = lambda: timer.timeit(number) / number
+    else:
+        loop = lambda: time_loop(function, reset)
+    times, references = [], []
+    for _ in range(repeat):
+        references.append(reference.timeit(reference_number) / reference_number)
+        times.append(loop())
+    return min(times) * 1000, min(references) * 1000
+
+
+def growth(sizes:list, times:list) -> float:
+    """ Exponent k of time ~ size**k fitted over the curve"""
+    sizes, times = np.array(sizes, dtype=float), np.maximum(np.array(times), 1e-6)
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+
+def run(names:list[str], repeat:int) -> dict:
+    results = {}
+    for name in names:
+        setup, sizes, unit, curve = BENCHMARKS[name]
+        references, times = [], []
+        for size in sizes:
+            # compare scales the baseline by the reference time of the point
+            ms, reference_ms = measure(setup, size, repeat)
+            times.append(ms)
+            references.append(reference_ms)
+        results[name] = {"unit": unit, "sizes": sizes, "ms": times, "reference_ms": references}
+        if curve:
+            results[name]["growth"] = growth(sizes, times)
+        report(name, results[name])
+    return results
+
+
+def report(name:str, result:dict) -> None:
+    points = "  ".join(f"{size:>5}: {ms:9.3f} ms" for size, ms in zip(result["sizes"], result["ms"]))
+    line = f"{name:<20} {points}"
+    if "growth" in result:
+        line += f"   growth {result['growth']:.2f} per {result['unit']}"
+        if result["growth"] > SUPERLINEAR:
+            line += "  <-- superlinear"
+    print(line)
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__, "pygame": pg.version.ver,
+            "machine": platform.machine(), "processor": platform.processor(), "created": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def compare(results:dict, baseline:dict, tolerance:float, repeat:int, retries:int) -> list[str]:
+    """ Returns descriptions of the points slower than baseline by more than tolerance.
+    Baseline times are scaled by how much faster or slower the reference work ran than when the baseline was saved.
+    A slow point is measured again up to retries times and its best try counts, one busy moment is no regression"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        setup = BENCHMARKS[name][0]
+        old_times = dict(zip(old["sizes"], old["ms"]))
+        old_references = dict(zip(old["sizes"], old.get("reference_ms", [])))
+        for size, ms, reference_ms in zip(result["sizes"], result["ms"], result["reference_ms"]):
+            if size not in old_times:
+                continue
+            old_reference = old_references.get(size, reference_ms)
+            ratio = ms / (old_times[size] * reference_ms / old_reference)
+            for _ in range(retries):
+                if ratio <= tolerance:
+                    break
+                try_ms, try_reference = measure(setup, size, repeat)
+                try_ratio = try_ms / (old_times[size] * try_reference / old_reference)
+                if try_ratio < ratio:
+                    ratio, ms, reference_ms = try_ratio, try_ms, try_reference
+            if ratio > tolerance:
+                speed = reference_ms / old_reference
+                regressions.append(f"{name} at {size} {result['unit']}: {old_times[size]:.3f} ms -> {ms:.3f} ms"
+                                   f" (machine speed {1/speed:.2f}x of the baseline, {old_times[size]*speed:.3f} ms expected)")
+    return regressions
+
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run, default all of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="timing loops per point, the fastest is used")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare with, exits with 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--retries", type=int, default=3, help="times a slow point is measured again before it counts")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run(names, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance, args.repeat, args.retries)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+""" Synthetic game states for the benchmarks. Headless games with N enemies along the path, M towers and P shots in flight"""
+import random
+
+from config.settings.enemies import enemy_dict
+from config.settings.general_config import Game, Window
+from config.settings.towers import tower_dict
+from game_manager.game_manager import GameManager
+from game_manager.timestep import per_tick
+from game_objects.enemies.enemy_object import EnemyObject
+
+BENCHMARK_LEVEL = 2
+BENCHMARK_SEED = 1
+TOWER_SIZE = Window.PIXEL_SIZE*4
+
+
+def empty_game(level:int=BENCHMARK_LEVEL, seed:int=BENCHMARK_SEED) -> GameManager:
+    """ Headless game with the map shown and nothing on it"""
+    game = GameManager(headless=True)
+    game.level = level
+    game.seed = seed
+    game.init_modules()
+    game.initialize()
+    game.show_map()
+    return game
+
+
+def create_enemies(game:GameManager, count:int, name:str="casual") -> list[EnemyObject]:
+    """ Enemies like enemies_creator makes them, not spawned yet"""
+    enemy_type = enemy_dict[name]
+    x, y = game.get_start()
+    enemies = []
+    for _ in range(count):
+        enemy = EnemyObject(enemy_type.HEALTH, x, y, enemy_type.SIZE, enemy_type.SIZE, None, enemy_type.SPEED, (0, 0),
+                            [None], 0, enemy_type.DETECTABLE, enemy_type.START_LEVEL, game.enemy_store)
+        game.enemies.add(enemy)
+        enemies.append(enemy)
+    return enemies
+
+
+def add_enemies(game:GameManager, count:int, rng:random.Random) -> None:
+    """ Spawns enemies spread along the routes, none of them at the end"""
+    for enemy in create_enemies(game, count):
+        game.ai.assign_path(enemy, per_tick(enemy.speed*Game.ENEMY_SPEED))
+        game.enemy_store.columns["distance"][enemy.entity.row] = rng.uniform(0, enemy.route.length*0.9)
+        game.living_enemies.add(enemy)
+        game.moving_objects.add(enemy)
+    # Zero length step puts everyone on their distance
+    speed = game.enemy_store.columns["speed"].copy()
+    game.enemy_store.columns["speed"][:] = 0
+    game.ai.move_enemies()
+    game.enemy_store.columns["speed"][:] = speed
+    game.enemy_grid.rebuild(game.living_enemies)
+
+
+def add_towers(game:GameManager, count:int, names:tuple=("basic", "eyes", "laser")) -> None:
+    """ Buys up to count projectile towers on free places, scanning the map row by row"""
+    height, width = game.converted_level.grid.shape
+    for y in range(0, height*Window.PIXEL_SIZE - TOWER_SIZE + 1, TOWER_SIZE):
+        for x in range(0, width*Window.PIXEL_SIZE - TOWER_SIZE + 1, TOWER_SIZE):
+            if len(game.towers) >= count:
+                return
+            game.coins = tower_dict[names[len(game.towers) % len(names)]].COST
+            game.buy_tower(tower_dict[names[len(game.towers) % len(names)]], (x, y))
+
+
+def add_projectiles(game:GameManager, count:int, rng:random.Random) -> None:
+    """ Shots fired by the towers at random enemies, waiting in the hit queue"""
+    towers = list(game.towers)
+    enemies = list(game.living_enemies)
+    if not towers or not enemies:
+        return
+    for index in range(count):
+        tower = towers[index % len(towers)]
+        tower.target = rng.choice(enemies)
+        game.fire(tower)
+
+
+def build_state(enemies:int=0, towers:int=0, projectiles:int=0, seed:int=0) -> GameManager:
+    """ Game with the given number of living enemies, towers and projectiles"""
+    rng = random.Random(seed)
+    # Enemies pick their routes with the global generator, states have to be the same in every run
+    random.seed(seed)
+    game = empty_game()
+    add_towers(game, towers)
+    add_enemies(game, enemies, rng)
+    add_projectiles(game, projectiles, rng)
+    return game
@@ -0,0 +1,102 @@
+""" Gameplay checks on whole headless games. Every check simulates a short game on the benchmark map and looks at its
+summary, so changes that break the fighting show up without playing.
+
+    python -m benchmarks.sim_checks
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import sys
+
+from benchmarks.scenario import BENCHMARK_LEVEL, BENCHMARK_SEED, TOWER_SIZE, empty_game
+from config.settings.general_config import Window
+from config.settings.towers import tower_dict
+from game_manager.simulation import simulate
+
+# Sides of a path tile a tower is tried on
+NEIGHBOUR_OFFSETS = ((Window.PIXEL_SIZE, 0), (-TOWER_SIZE, 0), (0, Window.PIXEL_SIZE), (0, -TOWER_SIZE))
+
+
+def path_placements(names:tuple, count:int, level:int=BENCHMARK_LEVEL, seed:int=BENCHMARK_SEED) -> list:
+    """ Up to count (tower name, (x, y)) placements right next to the path, tower types taken in turns"""
+    game = empty_game(level, seed)
+    placements = []
+    for x, y in game.converted_level.coords("path").tolist()[::8]:
+        name = names[len(placements) % len(names)]
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            game.coins = tower_dict[name].COST
+            if game.buy_tower(tower_dict[name], (x+dx, y+dy)):
+                placements.append((name, (x+dx, y+dy)))
+                break
+        if len(placements) >= count:
+            break
+    return placements
+
+
+def check_direct_hits_kill() -> list[str]:
+    """ Towers shooting single targets kill enemies and hold the first waves"""
+    result = simulate(BENCHMARK_LEVEL, max_waves=3, seed=BENCHMARK_SEED, towers=path_placements(("basic",), 8))
+    problems = []
+    if result["kills"] == 0:
+        problems.append("basic towers killed nothing")
+    if result["game_over"]:
+        problems.append(f"basic towers lost the game in wave {result['wave']}")
+    return problems
+
+
+def check_freeze_waves_finish() -> list[str]:
+    """ Freezing alone never holds enemies forever, the waves go on"""
+    max_ticks = 50_000
+    result = simulate(BENCHMARK_LEVEL, max_waves=2, max_ticks=max_ticks, seed=BENCHMARK_SEED,
+                      towers=path_placements(("yeti",), 3))
+    if result["ticks"] >= max_ticks:
+        return [f"yeti towers stalled wave {result['wave']} for {max_ticks} ticks"]
+    return []
+
+
+def check_unaligned_tower_refused() -> list[str]:
+    """ Towers stand on whole tiles, one between tile corners would overlap its neighbours"""
+    game = empty_game()
+    name, (x, y) = path_placements(("basic",), 1)[0]
+    game.coins = tower_dict[name].COST*100
+    game.buy_tower(tower_dict[name], (x, y))
+    half = Window.PIXEL_SIZE // 2
+    problems = []
+    # Every rect overlapping the tower that starts between tile corners
+    for dy in range(-TOWER_SIZE+half, TOWER_SIZE, half):
+        for dx in range(-TOWER_SIZE+half, TOWER_SIZE, half):
+            if (dx % Window.PIXEL_SIZE or dy % Window.PIXEL_SIZE) and game.buy_tower(tower_dict[name], (x+dx, y+dy)):
+                problems.append(f"second tower bought at {(x+dx, y+dy)} over the tower at {(x, y)}")
+    return problems
+
+
+CHECKS = {
+    "direct_hits_kill": check_direct_hits_kill,
+    "freeze_waves_finish": check_freeze_waves_finish,
+    "unaligned_tower_refused": check_unaligned_tower_refused,
+}
+
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"checks to run, default all of {', '.join(CHECKS)}")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(CHECKS)
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+
+    failed = 0
+    for name in names:
+        problems = CHECKS[name]()
+        print(f"{name:<24} {'FAIL' if problems else 'ok'}")
+        for problem in problems:
+            print(f"    {problem}")
+        failed += bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class TargetingPolicy(Enum):
+    FIRST = "First" #furthest along the path
+    LAST = "Last" #closest to the start
+    STRONGEST = "Strongest" #most hp
+    CLOSEST = "Closest" #closest to the tower
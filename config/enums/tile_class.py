@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+class TileClass(IntEnum):
+    """Values of the level tile grid (uint8)"""
+    FREE_TILE = 0
+    PATH = 1
+    START = 2
+    END = 3
+    WALL = 4 #horizontal wall color, "walls" in converted level
+    SPECIAL_WALL = 5 #vertical wall color, "special_wall" in converted level
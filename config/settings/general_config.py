@@ -24,10 +24,26 @@ class Window:
     GAME_HEIGHT = WINDOW_HEIGHT - GUI_HEIGHT
     GAME_WIDTH = WINDOW_WIDTH
 
+class Textures:
+    SCALED_CACHE_SIZE = 512 #How many scaled surfaces GraphicsManager keeps
+    ATLAS_SIZE = 2048 #Width and max height of one texture atlas sheet
+
 class Directory:
     BASE_DIR = os.getcwd()
     ASSETS_DIR = os.path.join(BASE_DIR, "assets")
     EXCLUDED_DIRS = ["fonts", "level_maps"] #for texture_loader
+    CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+    LEVEL_CACHE_DIR = os.path.join(CACHE_DIR, "levels")
+
+class Logging:
+    HOT_DEBUG = False #Debug messages of per frame code (drawing, spawning). python -O removes them completely
+
+class Profiling:
+    ENABLED = False #Time every phase of ticks and frames
+    OVERLAY = False #Show the percentiles on screen, F3 toggles it
+    BUFFER_SIZE = 65536 #Spans kept in the ring buffer
+    OVERLAY_REFRESH = 30 #Frames between overlay redraws
+    TRACE_PATH = os.path.join(Directory.CACHE_DIR, "trace.json") #Chrome trace, F4 or quitting writes it
     
 class Economy:
     STARTING_MONEY = 4000
@@ -38,11 +54,18 @@ class Economy:
     
 class Game:
     FPS = 60
+    TICK_RATE = 120 #Logic ticks per second, independent of FPS
+    MAX_TICKS_PER_FRAME = 30 #Catch up limit, game time slows down only when a frame takes longer than this
     START_LEVEL = 5
     START_WAVE = 0
+    #Speeds are in pixels and timers in frames at FPS, the game converts them to ticks
     PROJECTILE_SPEED = 4
     ENEMY_SPEED = 2
-    TOWER_RELOAD_TIMES = 20
+    TOWER_RELOAD_TIMES = 20 #Shortest reload of any tower
+    SPAWN_DELAY = 10
+    RANGE_UNIT = Window.PIXEL_SIZE*4 #Pixels of one tower RANGE point, one tower width
+    PROJECTILE_POOL_SIZE = 512 #Projectiles flying at once, towers wait when all are used
+    FREEZE_IMMUNITY = 1 #Seconds after a freeze during which the enemy can not be frozen again
 
 class Colors:
     BACKGROUND = (55, 55, 50)
@@ -1,6 +1,7 @@
 """Configuration file for towers"""
 from config.enums.towers_ability import Ability
 from config.enums.towers_ammo import Ammo
+from config.enums.targeting_policy import TargetingPolicy
 
 
 class Basic:
@@ -8,6 +9,7 @@ class Basic:
     TYPE = "projectile"
 
     RANGE = 2
+    TARGETING = TargetingPolicy.FIRST
     COST = 200
 
     DAMAGE = 1
@@ -25,6 +27,7 @@ class Eyes:
     TYPE = "projectile"
 
     RANGE = 3
+    TARGETING = TargetingPolicy.FIRST
     COST = 325
 
     DAMAGE = 1.5
@@ -42,6 +45,7 @@ class Cannon:
     TYPE = "splash"
 
     RANGE = 6
+    TARGETING = TargetingPolicy.STRONGEST
     COST = 500
 
     DAMAGE = 5
@@ -50,6 +54,8 @@ class Cannon:
     RELOAD_TIME = 1
     RELOAD_TIME_PER_LEVEL = -0.125
 
+    SPLASH_RADIUS = 0.5 #In RANGE points
+
     AMMO_TYPE = Ammo.ROCKET
 
     IMAGE = "cannon"
@@ -59,6 +65,7 @@ class Yeti:
     TYPE = "splash"
 
     RANGE = 3
+    TARGETING = TargetingPolicy.FIRST
     COST = 750
 
     DAMAGE = 0
@@ -67,9 +74,11 @@ class Yeti:
     RELOAD_TIME = 0
     RELOAD_TIME_PER_LEVEL = 0
 
-    FREEZE_TIME = 0.5
+    FREEZE_TIME = 0.5 #Seconds
     FREEZE_TIME_PER_LEVEL =  0.5
 
+    SPLASH_RADIUS = 0.75
+
     AMMO_TYPE = Ammo.SNOWFLAKE
 
     IMAGE = "yeti"
@@ -79,6 +88,7 @@ class Laser:
     TYPE = "projectile"
 
     RANGE = 5
+    TARGETING = TargetingPolicy.CLOSEST
     COST = 1000
 
     DAMAGE = 0.5
@@ -7,4 +7,5 @@ NUMBER_OF_WALLS_DICTIONARY  = {
     5: 30,
 }
 
-MINIMUM_LENGTH_OF_WALLS = 10
\ No newline at end of file
+MINIMUM_LENGTH_OF_WALLS = 10
+MAX_WALL_ATTEMPTS = 2000 # Random wall candidates tried per level before giving up
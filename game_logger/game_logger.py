@@ -0,0 +1,69 @@
+""" Project logging layer. Loggers remember whether their levels are enabled, so disabled messages cost
+one attribute check and nothing is formatted. Messages use lazy %-style arguments.
+
+Per frame code guards its messages with __debug__, which python -O turns into a compile-time False:
+
+    if __debug__ and log.debug_enabled:
+        log.debug("Spawned enemy %s", enemy)
+
+The levels are read when a logger is used for the first time, so logging.basicConfig after importing the game works.
+Later changes have to go through set_level.
+"""
+import logging
+import weakref
+
+from config.settings.general_config import Logging
+
+_loggers = weakref.WeakSet()
+
+
+class GameLogger:
+    """ Wrapper of logging.Logger with cached isEnabledFor. Hot loggers never log debug unless Logging.HOT_DEBUG is set"""
+
+    def __init__(self, name:str, hot:bool=False) -> None:
+        self.logger = logging.getLogger(name)
+        self.hot = hot
+        _loggers.add(self)
+
+    def __getattr__(self, name:str):
+        """ First read of the cached checks. Modules create their loggers on import, before logging is configured"""
+        if name in ("debug_enabled", "info_enabled", "warning_enabled"):
+            self.refresh()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def refresh(self) -> None:
+        """ Reads the enabled levels again. Called by set_level"""
+        self.debug_enabled = self.logger.isEnabledFor(logging.DEBUG) and (Logging.HOT_DEBUG or not self.hot)
+        self.info_enabled = self.logger.isEnabledFor(logging.INFO)
+        self.warning_enabled = self.logger.isEnabledFor(logging.WARNING)
+
+    def debug(self, message:str, *args) -> None:
+        if self.debug_enabled:
+            self.logger.debug(message, *args, stacklevel=2)
+
+    def info(self, message:str, *args) -> None:
+        if self.info_enabled:
+            self.logger.info(message, *args, stacklevel=2)
+
+    def warning(self, message:str, *args) -> None:
+        if self.warning_enabled:
+            self.logger.warning(message, *args, stacklevel=2)
+
+    def error(self, message:str, *args) -> None:
+        self.logger.error(message, *args, stacklevel=2)
+
+    def exception(self, message:str, *args) -> None:
+        self.logger.exception(message, *args, stacklevel=2)
+
+
+def get_logger(name:str, hot:bool=False) -> GameLogger:
+    """ Logger for a module, hot for modules running every frame"""
+    return GameLogger(name, hot)
+
+def set_level(level:int, name:str=None) -> None:
+    """ Sets level of a logger (root by default) and refreshes the cached checks of all game loggers.
+    Use this instead of Logger.setLevel, otherwise the cached checks keep the old level"""
+    logging.getLogger(name).setLevel(level)
+    for logger in list(_loggers):
+        logger.refresh()
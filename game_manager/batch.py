@@ -0,0 +1,175 @@
+""" Batch simulator for balance sweeps. Runs headless games in a process pool and streams
+their results into a columnar results directory (one .npz file per chunk, one array per column)"""
+import glob
+import importlib
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config.settings.general_config import Game
+from game_logger.game_logger import get_logger, set_level
+
+log = get_logger(__name__)
+
+# Columns of the results file and their dtypes
+COLUMNS = {
+    "game": np.int64, # Index of the game spec
+    "level": np.int64,
+    "seed": np.int64,
+    "placement": str,
+    "overrides": str, # JSON of the config overrides
+    "wave": np.int64,
+    "waves_survived": np.int64,
+    "ticks": np.int64,
+    "coins": np.int64,
+    "lives": np.int64,
+    "kills": np.int64,
+    "towers": np.int64,
+    "game_over": bool,
+    "elapsed": np.float64, # Seconds the game took in its worker
+    "ms_per_tick": np.float64,
+    "error": str, # Empty when the game finished
+}
+
+
+def game_spec(level:int=Game.START_LEVEL, seed:int=0, towers:list=None, placement:str="",
+              overrides:dict=None, max_waves:int=10, max_ticks:int=200_000) -> dict:
+    """ One game of a batch.
+    towers is a list of (tower name, (x, y)) placements, placement is its name in the results.
+    overrides map "module.Class.ATTRIBUTE" of config.settings to values, e.g. {"towers.Basic.DAMAGE": 2}.
+    Dicts can be indexed too, {"general_config.Wave_difficulty.waves_dict.2": my_curve} replaces a wave curve,
+    the curve has to be a module level function so it can be sent to the workers"""
+    return {"level": level, "seed": seed, "towers": towers or [], "placement": placement,
+            "overrides": overrides or {}, "max_waves": max_waves, "max_ticks": max_ticks}
+
+
+def sweep(levels:list[int], seeds:list[int], placements:dict=None, overrides:list[dict]=None, **limits) -> list[dict]:
+    """ Game specs for every combination of level, seed, placement script and override set.
+    placements maps script name to list of (tower name, (x, y))"""
+    placements = placements or {"": []}
+    overrides = overrides or [{}]
+    return [game_spec(level, seed, towers, name, override, **limits)
+            for level, seed, (name, towers), override in itertools.product(levels, seeds, placements.items(), overrides)]
+
+
+def override_target(path:str) -> tuple:
+    """ Returns (container, key) of an override path"""
+    module_name, *names = path.split(".")
+    target = importlib.import_module(f"config.settings.{module_name}")
+    for name in names[:-1]:
+        target = override_child(target, name)
+    return target, names[-1]
+
+def override_child(target, name:str):
+    if isinstance(target, dict):
+        return target[int(name) if name.lstrip("-").isdigit() else name]
+    return getattr(target, name)
+
+def apply_overrides(overrides:dict) -> list:
+    """ Sets config values. Returns what is needed to put the old values back"""
+    undo = []
+    for path, value in overrides.items():
+        target, key = override_target(path)
+        if isinstance(target, dict):
+            key = int(key) if key.lstrip("-").isdigit() else key
+            undo.append((target, key, target[key]))
+            target[key] = value
+        else:
+            undo.append((target, key, getattr(target, key)))
+            setattr(target, key, value)
+    return undo
+
+def restore_overrides(undo:list) -> None:
+    for target, key, value in reversed(undo):
+        if isinstance(target, dict):
+            target[key] = value
+        else:
+            setattr(target, key, value)
+
+
+def describe_overrides(overrides:dict) -> str:
+    return json.dumps({path: getattr(value, "__name__", value) for path, value in overrides.items()}, sort_keys=True, default=str)
+
+
+def run_game(index:int, spec:dict) -> dict:
+    """ Plays one game of the batch in a worker. Config overrides are undone afterwards, workers are reused"""
+    from game_manager.simulation import simulate
+
+    row = {"game": index, "level": spec["level"], "seed": spec["seed"], "placement": spec["placement"],
+           "overrides": describe_overrides(spec["overrides"]), "error": ""}
+    undo = []
+    try:
+        undo = apply_overrides(spec["overrides"])
+        result = simulate(spec["level"], spec["max_waves"], spec["max_ticks"], spec["seed"], spec["towers"])
+        row.update({column: result[column] for column in COLUMNS if column in result and column not in row})
+        row["ms_per_tick"] = result["elapsed"] * 1000 / max(result["ticks"], 1)
+    except Exception as e:
+        log.exception("Batch game %s failed", index)
+        row["error"] = repr(e)
+    finally:
+        restore_overrides(undo)
+    return row
+
+
+def init_worker() -> None:
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    set_level(logging.WARNING)
+
+
+class ResultsWriter:
+    """ Collects result rows and writes them as chunk files of columns"""
+
+    def __init__(self, directory:str, chunk_size:int=256) -> None:
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.chunks = len(glob.glob(os.path.join(directory, "chunk_*.npz")))
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, row:dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        columns = {}
+        for column, dtype in COLUMNS.items():
+            values = [row.get(column, 0 if dtype is not str else "") for row in self.rows]
+            columns[column] = np.array(values, dtype=dtype if dtype is not str else np.str_)
+        path = os.path.join(self.directory, f"chunk_{self.chunks:05d}.npz")
+        # Written under a hidden name, readers never see half a chunk
+        temporary = os.path.join(self.directory, f".chunk_{self.chunks:05d}.npz")
+        np.savez(temporary, **columns)
+        os.replace(temporary, path)
+        self.chunks += 1
+        self.rows = []
+
+
+def load_results(directory:str) -> dict:
+    """ Reads all chunks of a results directory. Returns column name -> array"""
+    chunks = [np.load(path) for path in sorted(glob.glob(os.path.join(directory, "chunk_*.npz")))]
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) if chunks else np.array([])
+            for column in COLUMNS}
+
+
+def run_batch(specs:list[dict], directory:str, workers:int=None, chunk_size:int=256) -> int:
+    """ Plays all games across a process pool. Results are written to directory as the games finish.
+    Returns the number of games that failed"""
+    writer = ResultsWriter(directory, chunk_size)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = [executor.submit(run_game, index, spec) for index, spec in enumerate(specs)]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            failed += bool(row["error"])
+            writer.add(row)
+            if done % chunk_size == 0:
+                log.info("Batch: %s of %s games done", done, len(specs))
+    writer.flush()
+    return failed
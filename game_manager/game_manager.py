@@ -2,11 +2,10 @@
 from pygame.sprite import RenderUpdates
 from pygame.time import Clock
 from pygame import QUIT, quit, font, locals, display, SCALED,event 
-from pygame.transform import scale
 import pygame as pg
 # python imports
-import logging
 import math
+import numpy as np
 import random
 
 
@@ -15,27 +14,38 @@ import random
 # config
 from config.settings.enemies import *
 from config.settings.towers import *
-from config.settings.general_config import Economy, Game, Difficulty, Wave_difficulty, Window, Colors
+from config.settings.general_config import Economy, Game, Difficulty, Wave_difficulty, Window, Colors, Profiling
 
 # objects
 # from game_objects.enemies.enemy_object import EnemyObject
 from game_objects.towers.projectile_tower import ProjectileTower
 from game_objects.towers.splash_tower import SplashTower
 from game_objects.tiles.tile_object import TileObject
+from game_objects.tiles.tile_grid import TileGrid
 from game_objects.tiles.tile_type import TileType
 from game_objects.towers.tower_type import TowerType
 from game_objects.towers.tower_object import TowerObject
 from game_objects.enemies.enemy_object import EnemyObject
 from game_objects.mobile_object import MobileObject
+from game_objects.projectiles.projectile_pool import ProjectilePool
+from game_objects.entity_store import EntityStore, detach
 
 # other
 from graphics_manager.graphics_manager import GraphicsManager
 from game_manager import wave_maker, spawn_delay
+from game_manager.profiler import FrameProfiler
+from game_manager.timestep import FixedTimestep, frames_to_ticks, per_tick, save_positions, interpolate_rects, snap_rects
 from level_converter.level_converter import convert_level
 from level_generator.level_generator import generate_level
-from level_generator.wall_generator import create_walls
+from level_generator.wall_generator import generate_walls
+from level_store.level_store import LevelStore
 
 from ai.ai import AI
+from ai.area_effects import AreaEffects
+from ai.intercept import HitQueue, intercept
+from ai.line_of_sight import LineOfSight
+from ai.spatial_grid import SpatialGrid
+from ai.targeting import Targeting
 
 
 # texture loader
@@ -44,12 +54,18 @@ from ai.ai import AI
 # gui
 from gui.gui import Gui
 
+from game_logger.game_logger import get_logger
+
+log = get_logger(__name__, hot=True)
+
 class GameManager:
     """ The ultimate class that controls everything everywhere """
-    def __init__(self) -> None:
+    def __init__(self, headless:bool=False) -> None:
+        self.headless = headless # No window, no textures, no drawing. Logic only
         self.gui = None
         self.graphics_manager = None
         self.ai = None
+        self.profiler = None # FrameProfiler when profiling is on
 
         self.changed_rects = []
         self.objects = RenderUpdates()
@@ -64,7 +80,17 @@ class GameManager:
         self.occupied_tiles = RenderUpdates()
         self.default_tiles = RenderUpdates()
         self.wall_tiles = RenderUpdates()
-        self.projectiles = RenderUpdates()
+        self.tile_grid = TileGrid()
+        # Numeric state of the objects, one component table per kind
+        self.enemy_store = EntityStore(EnemyObject.COMPONENTS)
+        self.tower_store = EntityStore(TowerObject.COMPONENTS)
+        self.projectile_store = EntityStore(MobileObject.COMPONENTS)
+        self.projectile_pool = ProjectilePool(Game.PROJECTILE_POOL_SIZE, self.projectiles, self.projectile_store)
+        self.enemy_grid = SpatialGrid()
+        self.line_of_sight = LineOfSight(self.tile_grid)
+        self.targeting = Targeting(self.enemy_grid, self.line_of_sight)
+        self.hits = HitQueue() # Shots in flight, solved when they were fired
+        self.area_effects = AreaEffects(self.enemy_store) # Splash and freeze hits of the current tick
 
         self.moving_objects = RenderUpdates()
         self.static_objects = RenderUpdates()
@@ -76,15 +102,19 @@ class GameManager:
         self.lives:int = Economy.STARTING_LIVES
         self.new_lives:int = Economy.STARTING_LIVES
         self.level:int = Game.START_LEVEL
+        self.seed:int = None # Seeded levels are taken from the level store
         self.wave:int = Game.START_WAVE
         self.new_wave:int = Game.START_WAVE
-        self.frames = 0
+        self.frames = 0 # Rendered frames
+        self.ticks = 0 # Logic ticks, all game timers count these
+        self.kills = 0
 
         self.converted_level = []
         self.clicked_card = None #Sprite, Rect  --> Tuple
         self.clicked_tower_type = None #TowerType
 
         self.clock = Clock()
+        self.timestep = FixedTimestep()
 
         self.running = True
         self.pause = False
@@ -99,6 +129,8 @@ class GameManager:
 
     def init_modules(self) -> None:
         """ Initialize some modules"""
+        if self.headless:
+            return
         font.init()
         self.graphics_manager = GraphicsManager()
         self.gui = Gui(self.graphics_manager)
@@ -106,18 +138,97 @@ class GameManager:
 
     def initialize(self):
         """ Initialize game"""
-        generate_level(self.level)
-        create_walls(self.level)
-        self.graphics_manager.init_graphics()
-        self.graphics_manager.load_all_textures()
+        # The level stays in memory as a tile class grid, no image round trip
+        routes = None
+        if self.seed is None:
+            level_grid = generate_level(self.level)
+            generate_walls(level_grid, self.level)
+        else:
+            stored_level = LevelStore().get(self.level, self.seed)
+            level_grid = stored_level.grid
+            routes = stored_level.routes
+        if not self.headless:
+            self.graphics_manager.init_graphics()
+            self.graphics_manager.load_all_textures()
+            tower_size = (Window.PIXEL_SIZE*4, Window.PIXEL_SIZE*4)
+            card_size = (Window.GUI_SCALE*Window.PIXEL_SIZE, Window.GUI_SCALE*Window.PIXEL_SIZE)
+            self.graphics_manager.prebake_scaled([tower_size, card_size])
+
+        self.converted_level = convert_level(self.level, level_grid)
+
+        self.ai = AI(self.converted_level, self.enemies, self.enemy_store)
+        self.ai.find_paths(self.converted_level["start"], routes)
+        self.line_of_sight.watch(self.ai.path_graph.adjacency)
 
-        self.converted_level = convert_level(self.level)
+    def get_animation(self, folder:str, name:str) -> list:
+        """ Get animation frames of a game object texture. Headless mode has no textures, so it returns a placeholder frame"""
+        if self.headless:
+            return [None]
+        return self.graphics_manager.textures["game_objects"][folder][name]
 
-        self.ai = AI(self.converted_level, self.enemies)
-        # self.ai.find_paths(self.converted_level["start"])
+    def get_image(self, folder:str, name:str, size:tuple):
+        """ Get first frame of a game object texture scaled to size. None in headless mode"""
+        if self.headless:
+            return None
+        return self.graphics_manager.get_scaled(folder, name, size)
 
 
 
+#------------------------------------------------------------------------------------------------------------
+#------------------------------------------------------------------------------------------------------------
+#---------------------------------------- PROFILER ----------------------------------------------------------
+#------------------------------------------------------------------------------------------------------------
+#------------------------------------------------------------------------------------------------------------
+
+    def enable_profiler(self, overlay:bool=Profiling.OVERLAY) -> FrameProfiler:
+        """ Times every phase of ticks and frames. The phase methods are replaced by timed ones on this instance,
+        so a game without profiler runs the plain methods. Call after init_modules and initialize"""
+        self.profiler = FrameProfiler()
+        self.profiler.instrument(self, {
+            "update": "tick",
+            "next_wave": "wave",
+            "spawn_enemy": "spawn",
+            "enemy_update": "movement",
+            "shoot": "targeting",
+            "update_projectiles": "hits",
+            "kill_dead_enemies": "deaths",
+        })
+        self.profiler.instrument(self.enemy_grid, {"rebuild": "grid"})
+        self.profiler.instrument(self.area_effects, {"resolve": "splash"})
+        if not self.headless:
+            self.profiler.instrument(self, {"render": "frame", "update_gui": "gui"})
+            self.profiler.instrument(self.graphics_manager, {"draw_group": "draw", "blit_rects": "blit", "flip": "flip"})
+            self.show_profiler_overlay(overlay)
+        return self.profiler
+
+    def show_profiler_overlay(self, show:bool) -> None:
+        if not show:
+            if self.graphics_manager.overlay is not None:
+                # Dirty rects would leave the last overlay on screen, the canvases are copied over it
+                self.graphics_manager.rects_to_update.append(self.graphics_manager.overlay_rect)
+            self.graphics_manager.overlay = None
+            return
+        self.update_profiler_overlay()
+
+    def update_profiler_overlay(self) -> None:
+        """ Renders the percentiles into the overlay surface of the graphics manager"""
+        font = self.gui.small_font
+        pool = self.projectile_pool.metrics()
+        lines = self.profiler.report_lines() + [f"projectiles  {len(self.hits)} in flight  {pool['active']} drawn  {pool['free']} free  {pool['exhausted']} exhausted"]
+        line_height = font.get_linesize()
+        overlay = pg.Surface((max(font.size(line)[0] for line in lines) + 8, line_height*len(lines) + 8))
+        overlay.fill(Colors.MENU_BG)
+        for index, line in enumerate(lines):
+            overlay.blit(font.render(line, True, Colors.MENU_TEXT), (4, 4 + index*line_height))
+        self.graphics_manager.overlay = overlay
+        self.graphics_manager.overlay_rect = overlay.get_rect(topright=(Window.WINDOW_WIDTH, Window.GUI_HEIGHT))
+
+    def dump_profile(self) -> None:
+        if self.profiler:
+            self.profiler.dump_chrome_trace()
+            log.info("Profile written to %s", Profiling.TRACE_PATH)
+
+
 #------------------------------------------------------------------------------------------------------------
 #------------------------------------------------------------------------------------------------------------
 #---------------------------------------- GUI ---------------------------------------------------------------
@@ -129,7 +240,7 @@ class GameManager:
         self.gui.show_towers(self.graphics_manager.textures)
 
     def update_changed_rects(self) -> None:
-        self.graphics_manager.rects_to_update = self.changed_rects
+        self.graphics_manager.rects_to_update += self.changed_rects
         self.graphics_manager.update()
         self.changed_rects = []
 
@@ -162,10 +273,9 @@ class GameManager:
                     print("Unknown tile type")
 
                 if special_wall:
-                    image = self.graphics_manager.textures["game_objects"]["tiles"]["horizontal_wall"][0]
+                    image = self.get_image("tiles", "horizontal_wall", (Window.PIXEL_SIZE, Window.PIXEL_SIZE))
                 else:
-                    image = self.graphics_manager.textures["game_objects"]["tiles"][tile][0]
-                image = scale(image, (Window.PIXEL_SIZE, Window.PIXEL_SIZE))     
+                    image = self.get_image("tiles", tile, (Window.PIXEL_SIZE, Window.PIXEL_SIZE))
 
                 tile_object = TileObject(rect.x, rect.y, Window.PIXEL_SIZE, Window.PIXEL_SIZE, image, t_type)
 
@@ -176,8 +286,13 @@ class GameManager:
                 elif t_type == TileType.WALL:
                     self.wall_tiles.add(tile_object)
                 self.tiles.add(tile_object)
+                self.tile_grid.add_tile(tile_object)
                 self.static_objects.add(tile_object)
-        self.graphics_manager.draw_group(self.tiles, True)
+        # Walls are known only now
+        self.line_of_sight.clear()
+        if not self.headless:
+            # Tiles never move, they are drawn once into the background
+            self.graphics_manager.bake_background(self.tiles)
                 
                 
 
@@ -189,12 +304,12 @@ class GameManager:
 
     def get_start(self) -> tuple:
         """ Get start position from level"""
-        logging.debug(f"Getting start position from level {self.level}")
+        log.debug("Getting start position from level %s", self.level)
         return self.converted_level["start"][0].x, self.converted_level["start"][0].y
 
     def enemies_creator(self, level:Difficulty, wave: int):
         """ Load wave from config. The wave is randomized"""
-        logging.debug(f"Loading wave {wave}")
+        log.debug("Loading wave %s", wave)
 
         wave_function = Wave_difficulty.waves_dict[level]
         number_of_enemies = int(wave_function(wave))  
@@ -211,25 +326,24 @@ class GameManager:
             try:
                 hp = enemy_dict[enemy_name].HEALTH
                 size = enemy_dict[enemy_name].SIZE
-                image = self.graphics_manager.textures["game_objects"]["enemies"][enemy_dict[enemy_name].IMAGE][0]
-                image = scale(image, (size, size))
+                animation = self.get_animation("enemies", enemy_dict[enemy_name].IMAGE)
+                image = self.get_image("enemies", enemy_dict[enemy_name].IMAGE, (size, size))
                 speed = enemy_dict[enemy_name].SPEED
                 direction = (0, 0)
                 animation_index = 0
-                animation = self.graphics_manager.textures["game_objects"]["enemies"][enemy_dict[enemy_name].IMAGE]
                 detectable = enemy_dict[enemy_name].DETECTABLE
                 lvl = enemy_dict[enemy_name].START_LEVEL
             except KeyError:
-                logging.debug(f"Enemy {enemy_name} is not in enemy_dict", KeyError)
+                log.debug("Enemy %s is not in enemy_dict", enemy_name)
             
-            enemy = EnemyObject(hp, x, y, size, size, image, speed, direction, animation, animation_index, detectable, lvl)
+            enemy = EnemyObject(hp, x, y, size, size, image, speed, direction, animation, animation_index, detectable, lvl, self.enemy_store)
             enemy_objects.append(enemy)
 
             # Adding the enemy into groups
             self.not_spawned_enemies.append(enemy)
             self.enemies.add(enemy)
 
-        logging.info(f"Loaded wave {wave} with {number_of_enemies} enemies")
+        log.info("Loaded wave %s with %s enemies", wave, number_of_enemies)
         
     
     def spawn_enemy(self, spawn_delay:int) -> None:
@@ -237,38 +351,28 @@ class GameManager:
         if len(self.not_spawned_enemies) == 0:
             return 
         
-        if self.frames % spawn_delay == 0:
+        if self.ticks % spawn_delay == 0:
             enemy = self.not_spawned_enemies.pop(0)
 
+            self.ai.assign_path(enemy, per_tick(enemy.speed*Game.ENEMY_SPEED))
             self.living_enemies.add(enemy)
             self.moving_objects.add(enemy)
 
-            logging.debug(f"Spawned enemy {enemy} with spawn delay {spawn_delay}")
+            if __debug__ and log.debug_enabled:
+                log.debug("Spawned enemy %s with spawn delay %s", enemy, spawn_delay)
             # Enemy is in living group and moving objects group --> One group will be drawn every frame
            
-    def enemy_update(self) -> None:
-        for enemy in self.living_enemies:
-            if enemy.hp <= 0:
-                enemy.kill()
-
-            # else:
-                # enemy_direction = self.ai.get_next_step(enemy)
-            end = self.converted_level["end"]
-            end_x, end_y = end[0].x, end[0].y
-            start = self.converted_level["start"]
-            start_x, start_y = start[0].x, start[0].x
-            vector = (end_x-start_x, end_y-start_y)
-            v_vector = (vector[0]**2 + vector[1]**2)**0.5
-            vector = vector[0] / v_vector, vector[1] / v_vector
-
+    def kill_enemy(self, enemy:EnemyObject) -> None:
+        """ Remove enemy from the game"""
+        enemy.kill()
+        self.ai.remove_enemy(enemy)
+        detach(enemy)
 
-
-            enemy.direction = vector
-            enemy.speed = Game.ENEMY_SPEED
-            enemy.move()
-            # print(vector)
-
-        self.graphics_manager.draw_group(self.living_enemies, True)
+    def enemy_update(self) -> None:
+        for enemy in self.ai.move_enemies():
+            # Enemy got through the defence
+            self.kill_enemy(enemy)
+            self.lives -= 1
 
 
     def next_wave(self) -> None:
@@ -280,9 +384,12 @@ class GameManager:
     def kill_all_enemies(self) -> None:
         """ Kill all enemies in the game"""
         for enemy in self.living_enemies:
-            enemy.kill()
+            self.kill_enemy(enemy)
         for enemy in self.not_spawned_enemies:
             enemy.kill()
+            detach(enemy)
+        # Their rows are free now, so they must not spawn later
+        self.not_spawned_enemies = []
         self.wave_running = False
 
         
@@ -299,119 +406,129 @@ class GameManager:
             x,y = position
             width = Window.PIXEL_SIZE*4
             height = Window.PIXEL_SIZE*4
+            if not self.tile_grid.can_place(x, y, width, height):
+                return False
+
             image_name = tower.IMAGE
-            image = self.graphics_manager.textures["game_objects"]["towers"][image_name][0]
-            image = scale(image, (width, height))
-            animation = self.graphics_manager.textures["game_objects"]["towers"][image_name]
+            animation = self.get_animation("towers", image_name)
+            image = self.get_image("towers", image_name, (width, height))
             damage = tower.DAMAGE
             reload_time = tower.RELOAD_TIME
             tower_type = tower
-            projectile_animation = self.graphics_manager.textures["game_objects"]["projectiles"][tower.AMMO_TYPE.value]
+            projectile_animation = self.get_animation("projectiles", tower.AMMO_TYPE.value)
 
             if tower.TYPE == "projectile":
-                tower_object = ProjectileTower(x, y, width, height, image, animation, damage, reload_time, tower_type, projectile_animation)
+                tower_object = ProjectileTower(x, y, width, height, image, animation, damage, reload_time, tower_type, projectile_animation, store=self.tower_store)
 
             elif tower.TYPE == "splash":
-                tower_object = SplashTower(x, y, width, height, image, animation, damage, reload_time, tower_type, projectile_animation)
+                tower_object = SplashTower(x, y, width, height, image, animation, damage, reload_time, tower_type, splash_animation=projectile_animation, store=self.tower_store)
 
             else:
-                logging.error(f"Cannot buy tower {tower} because it has unknown type")
+                log.error("Cannot buy tower %s because it has unknown type", tower)
                 return False
             
 
-            sus_tiles = []
-            # Sus tiles are all tiles under Tower Object 
-            for x in range(tower_object.rect.width//Window.PIXEL_SIZE):
-                for y in range(tower_object.rect.height//Window.PIXEL_SIZE):
-                    sus_tiles.append((tower_object.rect.x+x*Window.PIXEL_SIZE,tower_object.rect.y+y*Window.PIXEL_SIZE))
-
-            the_tiles = []
-            for tile in sus_tiles:
-                the_tiles += [o for o in self.default_tiles if o.rect.topleft == tile]
-                if len(the_tiles) == Window.CARD_RECT_WIDTH**2:
-                    for a_tile in the_tiles:
-                        self.default_tiles.remove(a_tile)
-                        self.occupied_tiles.add(a_tile)
-                        a_tile.type = TileType.OCCUPIED
-                elif tile in [o.rect.topleft for o in self.occupied_tiles]:
-                    tower_object.kill()
-                    return False
-                elif tile in [o.rect.topleft for o in self.towers]:
-                    tower_object.kill()
-                    return False
-                elif tile in [o.rect.topleft for o in self.wall_tiles]:
-                    tower_object.kill()
-                    return False
-                elif tile == sus_tiles[-1]:
-                    logging.error("Nezna tile type, nemuze zkontrolovat co je pod towerkou")
-                    tower_object.kill()
-                    return False
-                # SEM SE TO NORMALNE NEMUZE DOSTAT, JENOM KDYZ TO BUDE NEJAKY NOVY TILE TYPE
-     
+            # Tiles under the tower were checked by the tile grid, so they are all free
+            for a_tile in self.tile_grid.place_tower(tower_object):
+                self.default_tiles.remove(a_tile)
+                self.occupied_tiles.add(a_tile)
+
             self.static_objects.add(tower_object)
             self.towers.add(tower_object)
-            self.graphics_manager.draw_object(tower_object, True)
-            self.changed_rects.append(tower_object.rect)
+            # Rays are walked now, shooting only looks them up
+            self.line_of_sight.bitmap(tower_object)
+            if not self.headless:
+                self.graphics_manager.add_static(tower_object)
             self.coins -= tower.COST
             return True
         else:
             print("Not enough money")
             return False
         
-    def create_projectile(self, tower):
-        projectile = MobileObject(tower.rect.x, tower.rect.y, Window.PIXEL_SIZE, Window.PIXEL_SIZE, tower.projectile_animation[0], Game.PROJECTILE_SPEED, (0, 0))
-        self.projectiles.add(projectile)
+    def create_projectile(self, tower, start:tuple, end:tuple, lands:int) -> MobileObject:
+        """ Visible shot flying straight from start to end until the tick it lands on. None when the projectile pool is empty"""
+        animation = tower.projectile_animation if isinstance(tower, ProjectileTower) else tower.splash_animation
+        half = Window.PIXEL_SIZE / 2
+        # Speed is the part of the way flown per tick
+        projectile = self.projectile_pool.acquire(start[0]-half, start[1]-half, animation[0], 1 / max(lands-self.ticks, 1),
+                                                  tower.target, (end[0]-start[0], end[1]-start[1]))
+        if projectile is not None:
+            projectile.fired = self.ticks
         return projectile
-            
-    def shoot(self):   
-        """ Shoot from tower"""
-        if self.frames % Game.TOWER_RELOAD_TIMES == 0:
-            if len(self.projectiles) < len(self.living_enemies):
-                for tower in self.towers:
-                # Find closest enemy
-  
-                    projectile = self.create_projectile(tower)
-                    self.projectiles.add(projectile)
 
+    def remove_projectile(self, projectile:MobileObject) -> None:
+        self.projectile_pool.release(projectile)
+
+    def fire(self, tower) -> bool:
+        """ Solves where the shot of the tower meets its target and schedules the hit. False when the target
+        reaches the end first, the hit would be behind a wall or there is no free projectile to draw"""
+        target = tower.target
+        origin = tower.rect.center
+        shot_speed = per_tick(Game.PROJECTILE_SPEED)
+        # The shot aims at the center of the target, hits are stored in enemy position space
+        offset = target.rect.width/2, target.rect.height/2
+        solved = intercept(target.route, target.distance, target.speed, offset, origin, shot_speed)
+        if solved is None:
+            return False
+        flight, point = solved
+        # The target is seen now, but may walk behind a wall before the shot gets there
+        if not self.line_of_sight.sees(tower, *point):
+            return False
 
+        lands = self.ticks + math.ceil(flight)
+        projectile = None
+        if not self.headless:
+            projectile = self.create_projectile(tower, origin, point, lands)
+            if projectile is None:
+                return False
+        self.hits.schedule(lands, tower, target, (point[0]-offset[0], point[1]-offset[1]), projectile)
+        return True
 
-    def update_projectiles(self):
-        target = None
-        shortest_distance = 9999999999
+    def shoot(self):
+        """ Towers keep or pick their targets and fire when reloaded"""
+        self.targeting.update(self.towers)
+        for tower in self.towers:
+            if tower.target is not None and tower.reloaded(self.ticks) and self.fire(tower):
+                tower.fire(self.ticks)
 
+    def update_projectiles(self):
+        """ Lands the shots due on this tick. Nothing is simulated while they fly.
+        Direct hits are added up in one go, splash hits are left to the area effects"""
+        rows, damage = [], []
+        for tower, target, point, projectile in self.hits.due(self.ticks):
+            if projectile is not None:
+                self.remove_projectile(projectile)
+            if isinstance(tower, SplashTower):
+                # Explodes where it lands, whether the target is still there or not
+                self.area_effects.add(*tower.splash(*point))
+            # The target may have died or got through in the meantime
+            elif target.alive():
+                rows.append(target.entity.row)
+                damage.append(tower.damage)
+        if rows:
+            # One enemy can be hit by more shots on one tick
+            np.subtract.at(self.enemy_store.columns["hp"], rows, damage)
+
+    def kill_dead_enemies(self) -> None:
+        """ Removes walking enemies without hp, every one of them pays"""
+        columns = self.enemy_store.columns
+        dead = self.enemy_store.objects[columns["moving"] & (columns["hp"] <= 0)]
+        for enemy in dead:
+            if __debug__ and log.debug_enabled:
+                log.debug("Killed %s", enemy)
+            self.kill_enemy(enemy)
+        self.coins += Economy.MONEY_PER_KILL*len(dead)
+        self.kills += len(dead)
+
+    def place_projectiles(self, alpha:float) -> None:
+        """ Puts the visible shots on their way, alpha of a tick after the last tick"""
+        now = self.ticks + alpha
+        columns = self.projectile_store.columns
         for projectile in self.projectiles:
-            for enemy in self.enemies:
-                distance = ((projectile.rect.x - enemy.rect.x) ** 2 + (projectile.rect.y - enemy.rect.y) ** 2)
-                if distance < shortest_distance:
-                    shortest_distance = distance
-                    target = enemy
-
-            if not target:
-                self.projectiles.empty()
-            else:
-                vector = (target.rect.x-projectile.rect.x, target.rect.y-projectile.rect.y)
-                v_vector = (vector[0]**2 + vector[1]**2)**0.5
-                if v_vector != 0:
-                    vector = (vector[0] / v_vector, vector[1] / v_vector)
-
-                projectile.direction = vector
-                projectile.speed = Game.PROJECTILE_SPEED
-                projectile.move()
-
-
-    def projectile_hit(self):
-        if pg.sprite.groupcollide(self.projectiles, self.living_enemies, True, True):
-            print("Hit")
-            self.coins += Economy.MONEY_PER_KILL
-        if pg.sprite.groupcollide(self.projectiles, self.wall_tiles, True, False):
-            print("Hit wall")
-
-
-        
-
-
-    
-        
+            row = projectile.entity.row
+            part = min((now - projectile.fired) * columns["speed"][row], 1.)
+            projectile.rect.x = columns["x"][row] + columns["direction_x"][row]*part
+            projectile.rect.y = columns["y"][row] + columns["direction_y"][row]*part
 
 
 #------------------------------------------------------------------------------------------------------------
@@ -442,10 +559,10 @@ class GameManager:
     
     def handle_click_on_map(self):
         """ Handle click on map for tower placement"""
-        clicked_tiles = [tile for tile in self.tiles if tile.rect.collidepoint(pg.mouse.get_pos()[0], pg.mouse.get_pos()[1]-Window.GUI_HEIGHT)]
-        if not clicked_tiles:
+        mouse_x, mouse_y = pg.mouse.get_pos()
+        clicked_tile = self.tile_grid.tile_at(mouse_x, mouse_y-Window.GUI_HEIGHT)
+        if not clicked_tile:
             return False # kdyz kliknu mimo mapu (GUI)
-        clicked_tile = clicked_tiles[0]
         rectangle = clicked_tile.rect.copy()
         self.buy_tower(self.clicked_tower_type, (rectangle.x, rectangle.y)) # Can be succesful or not
 
@@ -464,6 +581,7 @@ class GameManager:
 
         for event in pg.event.get():
             if event.type == QUIT:
+                self.dump_profile()
                 quit()
             elif event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
@@ -472,6 +590,10 @@ class GameManager:
                 if event.key == pg.K_SPACE:
                     self.kill_all_enemies()
                     self.next_wave()
+                if event.key == pg.K_F3 and self.profiler:
+                    self.show_profiler_overlay(self.graphics_manager.overlay is None)
+                if event.key == pg.K_F4:
+                    self.dump_profile()
 
             elif (event.type == pg.MOUSEBUTTONDOWN and event.button == 1) and self.click_on_card():
                 self.graphics_manager.draw_rect(self.clicked_card[1], Colors.BUTTONS, False, self.gui.background)
@@ -484,28 +606,33 @@ class GameManager:
 
 
     def update(self) -> None:
-        """ Update game state every frame"""
-        self.update_gui()
-        self.update_changed_rects()
+        """ One logic tick. Nothing here depends on frames or wall clock time"""
+        save_positions(self.enemy_store)
         if len(self.living_enemies) == 0 and len(self.not_spawned_enemies) == 0:
             self.wave_running = False
             self.next_wave()
 
         # Tohle az bude spawn delay existovat
         # self.spawn_enemy(spawn_delay.spawn_delay(self.not_spawned_enemies[0], self.not_spawned_enemies[1]))
-        self.spawn_enemy(10)
+        self.spawn_enemy(frames_to_ticks(Game.SPAWN_DELAY))
         self.enemy_update()
+        self.enemy_grid.rebuild(self.living_enemies)
         self.shoot()
         self.update_projectiles()
-        self.projectile_hit()
-
-        pg.sprite.groupcollide(self.living_enemies, self.wall_tiles, True, False)
+        self.area_effects.resolve(self.ai.motion)
+        self.kill_dead_enemies()
 
-
-        self.graphics_manager.draw_group(self.tiles, True)
-        self.graphics_manager.draw_group(self.towers, True)
+    def render(self, alpha:float) -> None:
+        """ Draw the frame. Moving sprites are drawn alpha of the way between their last two tick positions"""
+        self.update_gui()
+        interpolate_rects(self.living_enemies, alpha)
+        self.place_projectiles(alpha)
+        # Only moving sprites are redrawn, tiles and towers are in the background
         self.graphics_manager.draw_group(self.living_enemies, True)
         self.graphics_manager.draw_group(self.projectiles, True)
+        # Logic works with the tick positions
+        snap_rects(self.living_enemies)
+        self.update_changed_rects()
 
     def run(self) -> None:
         """ Main game loop"""
@@ -515,20 +642,61 @@ class GameManager:
         self.show_map()
 
         self.gui.create_gui(self.lives, self.coins, self.wave, self.graphics_manager.textures)
+        if Profiling.ENABLED:
+            self.enable_profiler()
 
         # prvni start wavky
         self.next_wave()
 
         self.frames = 0
+        self.ticks = 0
         while self.running:
-            self.clock.tick(Game.FPS)
+            frame_time = self.clock.tick(Game.FPS) / 1000
             self.handle_input()
 
             if self.pause:
                 continue
 
             self.frames += 1 #bezi kdzy neni pauza
-            self.lives = self.frames
+            for _ in range(self.timestep.advance(frame_time)):
+                self.ticks += 1
+                self.update()
+            if self.graphics_manager.overlay is not None and self.frames % Profiling.OVERLAY_REFRESH == 0:
+                self.update_profiler_overlay()
+            self.render(self.timestep.alpha)
+
+    def run_headless(self, max_waves:int, max_ticks:int, towers:list=None) -> dict:
+        """ Game loop without window and frame cap, only logic ticks. Runs until the game is lost or a limit is reached.
+        towers is a list of (tower name, (x, y)) placements bought before the first wave"""
+        self.headless = True
+        self.init_modules()
+        self.initialize()
+        self.show_map()
+        if Profiling.ENABLED:
+            self.enable_profiler()
+
+        for tower_name, position in towers or []:
+            self.buy_tower(tower_dict[tower_name], position)
+
+        self.next_wave()
+
+        self.ticks = 0
+        while self.lives > 0 and self.wave <= max_waves and self.ticks < max_ticks:
+            self.ticks += 1
             self.update()
-    
-    
+
+        return self.summary()
+
+    def summary(self) -> dict:
+        """ Result of the game so far"""
+        return {
+            "level": self.level,
+            "wave": self.wave,
+            "waves_survived": max(self.wave - 1, 0),
+            "ticks": self.ticks,
+            "coins": self.coins,
+            "lives": self.lives,
+            "kills": self.kills,
+            "towers": len(self.towers),
+            "game_over": self.lives <= 0,
+        }
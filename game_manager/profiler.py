@@ -0,0 +1,89 @@
+""" Frame profiler. Spans of the game loop phases are kept in a ring buffer,
+reported as rolling percentiles and exported as Chrome trace JSON (chrome://tracing, Perfetto)"""
+import functools
+import json
+import os
+from time import perf_counter_ns
+
+import numpy as np
+
+from config.settings.general_config import Profiling
+
+
+class FrameProfiler:
+    """ Ring buffer of (phase, start, duration) spans in nanoseconds.
+    Phases are timed by wrapping their functions, so nothing is paid when the profiler is not used"""
+
+    def __init__(self, capacity:int=Profiling.BUFFER_SIZE) -> None:
+        self.capacity = capacity
+        self.names = [] # phase id -> name
+        self.ids = {} # name -> phase id
+        self.phases = np.zeros(capacity, dtype=np.int32)
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        self.durations = np.zeros(capacity, dtype=np.int64)
+        self.count = 0 # Spans recorded so far, also the next write position
+
+    def phase_id(self, name:str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def record(self, phase:int, start:int, end:int) -> None:
+        index = self.count % self.capacity
+        self.phases[index] = phase
+        self.starts[index] = start
+        self.durations[index] = end - start
+        self.count += 1
+
+    def wrap(self, name:str, function):
+        """ Returns function that records a span every time it is called"""
+        phase = self.phase_id(name)
+        record = self.record
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(phase, start, perf_counter_ns())
+        return timed
+
+    def instrument(self, owner, phases:dict) -> None:
+        """ Replaces methods of owner by timed ones. phases maps method name to phase name"""
+        for method, name in phases.items():
+            setattr(owner, method, self.wrap(name, getattr(owner, method)))
+
+    def spans(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Phases, starts and durations of the spans in the buffer, oldest first"""
+        if self.count <= self.capacity:
+            return self.phases[:self.count], self.starts[:self.count], self.durations[:self.count]
+        order = np.roll(np.arange(self.capacity), -(self.count % self.capacity))
+        return self.phases[order], self.starts[order], self.durations[order]
+
+    def percentiles(self) -> dict:
+        """ Rolling p50, p95 and p99 of every phase in milliseconds, over the spans in the buffer"""
+        phases, _, durations = self.spans()
+        report = {}
+        for phase, name in enumerate(self.names):
+            phase_durations = durations[phases == phase]
+            if phase_durations.size:
+                report[name] = tuple((np.percentile(phase_durations, (50, 95, 99)) / 1e6).tolist())
+        return report
+
+    def report_lines(self) -> list[str]:
+        return [f"{name:<12} p50 {p50:7.3f}  p95 {p95:7.3f}  p99 {p99:7.3f} ms"
+                for name, (p50, p95, p99) in self.percentiles().items()]
+
+    def dump_chrome_trace(self, path:str=Profiling.TRACE_PATH) -> None:
+        """ Writes the spans in the buffer as Chrome trace events"""
+        phases, starts, durations = self.spans()
+        origin = int(starts.min()) if starts.size else 0
+        pid = os.getpid()
+        events = [{"name": self.names[phase], "cat": "game", "ph": "X", "pid": pid, "tid": 0,
+                   "ts": (start - origin) / 1000, "dur": duration / 1000}
+                  for phase, start, duration in zip(phases.tolist(), starts.tolist(), durations.tolist())]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as trace:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace)
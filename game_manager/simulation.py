@@ -0,0 +1,25 @@
+""" Headless simulation API. Runs whole games without a window, as fast as the CPU allows"""
+import random
+import time
+
+from config.settings.general_config import Game
+from game_manager.game_manager import GameManager
+
+
+def simulate(level:int=Game.START_LEVEL, max_waves:int=10, max_ticks:int=200_000,
+             seed:int=None, towers:list=None) -> dict:
+    """ Play one headless game and return its result summary.
+    towers is a list of (tower name, (x, y)) placements bought before the first wave.
+    With seed the map comes from the level store, so repeated games on it start without generating"""
+    if seed is not None:
+        random.seed(seed)
+
+    game = GameManager(headless=True)
+    game.level = level
+    game.seed = seed
+
+    start = time.perf_counter()
+    result = game.run_headless(max_waves, max_ticks, towers)
+    result["seed"] = seed
+    result["elapsed"] = time.perf_counter() - start
+    return result
@@ -1,8 +1,8 @@
 from config.settings.general_config import Game
 
 def spawn_delay(enemy, the_enemy_after)-> int:
-    """ Calculate spawn delay for the upcoming enemy  in frames"""
-    return Game.FPS
+    """ Calculate spawn delay for the upcoming enemy  in ticks"""
+    return Game.TICK_RATE
 
 # Now it's one per second
 # TODO create AI system that choose a good delay for the upcoming enemy
\ No newline at end of file
@@ -0,0 +1,67 @@
+""" Fixed timestep. Game logic runs in ticks of constant length, rendering happens whenever a frame is ready"""
+from pygame.sprite import Group
+
+from config.settings.general_config import Game
+
+
+def frames_to_ticks(frames:float) -> int:
+    """ Converts a timer given in frames at Game.FPS into ticks"""
+    return max(1, round(frames * Game.TICK_RATE / Game.FPS))
+
+def seconds_to_ticks(seconds:float) -> int:
+    return max(1, round(seconds * Game.TICK_RATE))
+
+def per_tick(per_frame:float) -> float:
+    """ Converts a speed in pixels per frame at Game.FPS into pixels per tick"""
+    return per_frame * Game.FPS / Game.TICK_RATE
+
+
+class FixedTimestep:
+    """ Accumulates real frame time and pays it out as whole logic ticks"""
+
+    def __init__(self, tick_rate:int=Game.TICK_RATE, max_ticks:int=Game.MAX_TICKS_PER_FRAME) -> None:
+        self.tick_length = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.
+
+    def advance(self, seconds:float) -> int:
+        """ Adds frame time, returns how many ticks should run now"""
+        self.accumulator += seconds
+        ticks = int(self.accumulator // self.tick_length)
+        if ticks > self.max_ticks:
+            # Too far behind, drop the rest instead of spiralling
+            ticks = self.max_ticks
+            self.accumulator = 0.
+        else:
+            self.accumulator -= ticks * self.tick_length
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """ How far between the last two ticks the current frame is, 0 to 1"""
+        return min(self.accumulator / self.tick_length, 1.)
+
+
+def save_positions(store) -> None:
+    """ Remembers positions of all objects in the store before a tick moves them"""
+    columns = store.columns
+    columns["previous_x"][:] = columns["x"]
+    columns["previous_y"][:] = columns["y"]
+
+def interpolate_rects(group:Group, alpha:float) -> None:
+    """ Puts rects of the group between the previous and current tick position, for drawing"""
+    for sprite in group:
+        columns = sprite.entity.store.columns
+        row = sprite.entity.row
+        previous_x = columns["previous_x"][row]
+        previous_y = columns["previous_y"][row]
+        sprite.rect.x = previous_x + (columns["x"][row] - previous_x) * alpha
+        sprite.rect.y = previous_y + (columns["y"][row] - previous_y) * alpha
+
+def snap_rects(group:Group) -> None:
+    """ Puts rects of the group back on the current tick position"""
+    for sprite in group:
+        columns = sprite.entity.store.columns
+        row = sprite.entity.row
+        sprite.rect.x = columns["x"][row]
+        sprite.rect.y = columns["y"][row]
@@ -1,16 +1,25 @@
 from game_objects.game_object import GameObject
+from game_objects.entity_store import Component, EntityStore, attach
 from pygame.surface import Surface
 from pygame.sprite import Sprite
+import numpy as np
 
 class ActiveObject(GameObject):
     """ Class for objects that do something on their own """
 
+    COMPONENTS = {"animation_index": np.int64, "lvl": np.int64}
+
+    animation_index = Component()
+    lvl = Component()
+
     def __init__(
         self, x:int, y:int, width:int, height:int, image:Surface,
-         animation:list[Surface], animation_index:int = 0, lvl:int=1
+         animation:list[Surface], animation_index:int = 0, lvl:int=1,
+         store:EntityStore=None
         ) -> None:
 
         GameObject.__init__(self,x,y,width,height,image)
+        attach(self, store)
         self.animation=animation
         self.animation_index=animation_index
         self.lvl=lvl
@@ -33,4 +42,4 @@ class ActiveObject(GameObject):
         self.animation = animation
 
  
-          
\ No newline at end of file
+          
@@ -1,25 +1,53 @@
 from game_objects.active_object import ActiveObject
 from game_objects.mobile_object import MobileObject
+from game_objects.game_object import GameObject
+from game_objects.entity_store import Component, EntityStore, attach
 
 from game_objects.enemies.enemy_type import EnemyType
 from pygame.surface import Surface
+import numpy as np
 
 
 class EnemyObject(ActiveObject,MobileObject):
     """ Most general class for enemy objects """
 
+    COMPONENTS = {
+        **ActiveObject.COMPONENTS, **MobileObject.COMPONENTS,
+        "hp": np.float64, "detectable": np.bool_,
+        # Position on the path, used by the batched motion in AI
+        "distance": np.float64, "route_id": np.int64, "moving": np.bool_,
+        # speed is 0 while frozen, walk_speed is what it returns to. Ticks left of the freeze and of the immunity after it
+        "walk_speed": np.float64, "frozen": np.float64, "immune": np.float64,
+    }
+
+    hp = Component()
+    detectable = Component()
+    distance = Component() # Pixels walked along the route
+
     def __init__(self, hp:int, 
     x: int, y: int, width:int, height:int, image: Surface, 
     speed:int, direction:tuple[int],
     animation:list[Surface], animation_index:int = 0,
-    detectable:bool=True,lvl:int=1
+    detectable:bool=True,lvl:int=1,
+    store:EntityStore=None
     ) -> None:
-        ActiveObject.__init__(self,x,y,width,height,image,animation,animation_index,lvl)
-        MobileObject.__init__(self,x,y,width,height,image,speed,direction)
+        # One initializer for the whole diamond, so there is only one Sprite and one Rect
+        GameObject.__init__(self,x,y,width,height,image)
+        attach(self, store)
+        self.animation=animation
+        self.animation_index=animation_index
+        self.lvl=lvl
+        self.x=x
+        self.y=y
+        self.speed=speed
+        self.direction=direction
 
         self.hp=hp
         self.detectable=detectable
 
+        # Path of the enemy, set by AI
+        self.route=None
+
     def update(self)->None:
         ActiveObject.update(self)
         MobileObject.update(self)
@@ -0,0 +1,102 @@
+""" Struct of arrays storage for the numeric state of game objects"""
+import numpy as np
+
+
+class EntityStore:
+    """ Component table. Every component is one array, every entity is one row"""
+
+    def __init__(self, components:dict, capacity:int=256) -> None:
+        self.components = components
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in components.items()}
+        self.objects = np.empty(capacity, dtype=object)
+        self.used = np.zeros(capacity, dtype=bool)
+        self.free_rows = list(range(capacity-1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self.used) - len(self.free_rows)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.used)
+
+    def grow(self) -> None:
+        """ Doubles the number of rows"""
+        capacity = self.capacity
+        for name, column in self.columns.items():
+            self.columns[name] = np.concatenate((column, np.zeros(capacity, dtype=column.dtype)))
+        self.objects = np.concatenate((self.objects, np.empty(capacity, dtype=object)))
+        self.used = np.concatenate((self.used, np.zeros(capacity, dtype=bool)))
+        self.free_rows.extend(range(capacity*2-1, capacity-1, -1))
+
+    def allocate(self, owner=None) -> int:
+        """ Returns a zeroed row for a new entity"""
+        if not self.free_rows:
+            self.grow()
+        row = self.free_rows.pop()
+        for column in self.columns.values():
+            column[row] = 0
+        self.objects[row] = owner
+        self.used[row] = True
+        return row
+
+    def release(self, row:int) -> None:
+        """ Gives the row back to the store"""
+        if not self.used[row]:
+            return
+        self.used[row] = False
+        self.objects[row] = None
+        self.free_rows.append(row)
+
+
+class EntityHandle:
+    """ Lightweight reference to one row of a store"""
+    __slots__ = ("store", "row")
+
+    def __init__(self, store:EntityStore, row:int) -> None:
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, name:str):
+        return self.store.columns[name][self.row]
+
+    def __setitem__(self, name:str, value) -> None:
+        self.store.columns[name][self.row] = value
+
+    @property
+    def object(self):
+        """ The game object that owns the row"""
+        return self.store.objects[self.row]
+
+
+class Component:
+    """ Attribute of a game object that is a view into a column of its entity store"""
+    __slots__ = ("name",)
+
+    def __set_name__(self, owner, name:str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        entity = instance.entity
+        return entity.store.columns[self.name][entity.row]
+
+    def __set__(self, instance, value) -> None:
+        entity = instance.entity
+        entity.store.columns[self.name][entity.row] = value
+
+
+def attach(game_object, store:EntityStore=None) -> EntityHandle:
+    """ Gives game object a row in the store. Objects created without a store share one store per class"""
+    if store is None:
+        cls = type(game_object)
+        if cls.__dict__.get("default_store") is None:
+            cls.default_store = EntityStore(cls.COMPONENTS)
+        store = cls.default_store
+    game_object.entity = EntityHandle(store, store.allocate(game_object))
+    return game_object.entity
+
+
+def detach(game_object) -> None:
+    """ Releases the row of the game object"""
+    game_object.entity.store.release(game_object.entity.row)
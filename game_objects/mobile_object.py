@@ -1,15 +1,42 @@
 from game_objects.game_object import GameObject
+from game_objects.entity_store import Component, EntityStore, attach
 from pygame.sprite import Sprite
+import numpy as np
 
 class MobileObject(GameObject):
     """ Class for objects that move """
 
+    COMPONENTS = {"x": np.float64, "y": np.float64, "previous_x": np.float64, "previous_y": np.float64,
+                  "speed": np.float64, "direction_x": np.float64, "direction_y": np.float64}
+
+    x = Component()
+    y = Component()
+    previous_x = Component() # Position before the last tick, for interpolated drawing
+    previous_y = Component()
+    speed = Component()
+    direction_x = Component()
+    direction_y = Component()
+
     def __init__(
-        self, x: int, y: int, width:int, height:int, image: Sprite, speed:int, direction:tuple[int]
+        self, x: int, y: int, width:int, height:int, image: Sprite, speed:int, direction:tuple[int],
+        store:EntityStore=None
         ) -> None:
         super().__init__(x,y,width,height,image)
+        attach(self, store)
+        self.x=x
+        self.y=y
+        self.previous_x=x
+        self.previous_y=y
         self.speed=speed
         self.direction=direction
+
+    @property
+    def direction(self)->tuple:
+        return self.direction_x, self.direction_y
+
+    @direction.setter
+    def direction(self, direction:tuple)->None:
+        self.direction_x, self.direction_y = direction
     
     def update(self)->None:
         """update"""
@@ -18,6 +45,10 @@ class MobileObject(GameObject):
     
     def move(self):
         """ Moves the object by its speed in its direction """
-
-        self.rect=self.rect.move(self.direction[0]*self.speed, self.direction[1]*self.speed)
+        columns = self.entity.store.columns
+        row = self.entity.row
+        columns["x"][row] += columns["direction_x"][row]*columns["speed"][row]
+        columns["y"][row] += columns["direction_y"][row]*columns["speed"][row]
+        self.rect.x = columns["x"][row]
+        self.rect.y = columns["y"][row]
 
@@ -0,0 +1,57 @@
+""" Pool of reusable projectiles"""
+from pygame.sprite import AbstractGroup
+from pygame.surface import Surface
+
+from config.settings.general_config import Window
+from game_objects.entity_store import EntityStore
+from game_objects.mobile_object import MobileObject
+
+
+class ProjectilePool:
+    """ At most capacity projectiles, created when they are first needed. Firing takes a free one, hitting gives it back,
+    so sprites, rects and store rows live as long as the game"""
+
+    def __init__(self, capacity:int, group:AbstractGroup, store:EntityStore=None) -> None:
+        self.capacity = capacity
+        self.group = group # Active projectiles
+        self.store = store
+        self.created = 0
+        self.free = []
+        self.exhausted = 0 # Shots that found the pool empty
+
+    def acquire(self, x:float, y:float, image:Surface, speed:float, target=None, direction:tuple=(0, 0)) -> MobileObject:
+        """ Puts a free projectile at x, y. Returns None when all projectiles are flying"""
+        if self.free:
+            projectile = self.free.pop()
+        elif self.created < self.capacity:
+            size = Window.PIXEL_SIZE
+            projectile = MobileObject(0, 0, size, size, None, 0, (0, 0), self.store)
+            self.created += 1
+        else:
+            self.exhausted += 1
+            return None
+        projectile.x = projectile.previous_x = x
+        projectile.y = projectile.previous_y = y
+        projectile.rect.x = x
+        projectile.rect.y = y
+        projectile.image = image
+        projectile.speed = speed
+        projectile.direction = direction
+        projectile.target = target
+        self.group.add(projectile)
+        return projectile
+
+    def release(self, projectile:MobileObject) -> None:
+        """ Takes the projectile out of the game, it can be fired again"""
+        if not self.group.has(projectile):
+            return
+        self.group.remove(projectile)
+        projectile.target = None
+        self.free.append(projectile)
+
+    @property
+    def active(self) -> int:
+        return self.created - len(self.free)
+
+    def metrics(self) -> dict:
+        return {"active": self.active, "free": self.capacity - self.active, "capacity": self.capacity, "exhausted": self.exhausted}
@@ -0,0 +1,92 @@
+from config.settings.general_config import Window
+from game_objects.tiles.tile_object import TileObject
+from game_objects.tiles.tile_type import TileType
+
+
+class TileGrid:
+    """ Index of the map tiles keyed by tile coordinates """
+
+    def __init__(self, width:int=Window.TILES_IN_WIDTH, height:int=Window.TILES_IN_HEIGHT) -> None:
+        self.width = width
+        self.height = height
+        # Flat row-major arrays, one cell per tile
+        self.types = [None] * (width*height)
+        self.tiles = [None] * (width*height)
+        self.towers = [None] * (width*height)
+
+    def cell(self, x:int, y:int) -> int:
+        """ Returns index of the cell under pixel position, -1 when it is outside the map"""
+        tile_x = x // Window.PIXEL_SIZE
+        tile_y = y // Window.PIXEL_SIZE
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return tile_y*self.width + tile_x
+        return -1
+
+    def add_tile(self, tile:TileObject) -> None:
+        """ Registers tile in its cell"""
+        index = self.cell(tile.rect.x, tile.rect.y)
+        self.types[index] = tile.type
+        self.tiles[index] = tile
+
+    def tile_at(self, x:int, y:int) -> TileObject:
+        """ Returns tile under pixel position or None"""
+        index = self.cell(x, y)
+        if index == -1:
+            return None
+        return self.tiles[index]
+
+    def footprint(self, x:int, y:int, width:int, height:int) -> list[int]:
+        """ Returns cells covered by the rect, None when some part is outside the map"""
+        cells = []
+        for tile_y in range(y, y+height, Window.PIXEL_SIZE):
+            for tile_x in range(x, x+width, Window.PIXEL_SIZE):
+                index = self.cell(tile_x, tile_y)
+                if index == -1:
+                    return None
+                cells.append(index)
+        return cells
+
+    def can_place(self, x:int, y:int, width:int, height:int) -> bool:
+        """ Checks if every tile under the rect is free for building. Towers stand on whole tiles, so the rect has to
+        start on a tile corner, otherwise it would cover tiles its footprint does not hold"""
+        if x % Window.PIXEL_SIZE or y % Window.PIXEL_SIZE:
+            return False
+        cells = self.footprint(x, y, width, height)
+        if cells is None:
+            return False
+        return all(self.types[index] == TileType.DEFAULT and self.towers[index] is None for index in cells)
+
+    def place_tower(self, tower) -> list[TileObject]:
+        """ Marks tiles under the tower as occupied. Returns the tiles that were built on"""
+        built_on = []
+        for index in self.footprint(tower.rect.x, tower.rect.y, tower.rect.width, tower.rect.height):
+            self.types[index] = TileType.OCCUPIED
+            self.towers[index] = tower
+            tile = self.tiles[index]
+            if tile:
+                tile.built_on()
+                built_on.append(tile)
+        return built_on
+
+    def cells_on_line(self, x0:float, y0:float, x1:float, y1:float) -> list[int]:
+        """ Cells the line between two pixel positions goes through, in order. Bresenham over tile coordinates,
+        the line stops at the edge of the map"""
+        tile_x, tile_y = int(x0 // Window.PIXEL_SIZE), int(y0 // Window.PIXEL_SIZE)
+        end_x, end_y = int(x1 // Window.PIXEL_SIZE), int(y1 // Window.PIXEL_SIZE)
+        dx, dy = abs(end_x-tile_x), -abs(end_y-tile_y)
+        step_x = 1 if tile_x < end_x else -1
+        step_y = 1 if tile_y < end_y else -1
+        error = dx + dy
+        cells = []
+        while 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            cells.append(tile_y*self.width + tile_x)
+            if tile_x == end_x and tile_y == end_y:
+                break
+            double = 2*error
+            if double >= dy:
+                error += dy
+                tile_x += step_x
+            if double <= dx:
+                error += dx
+                tile_y += step_y
+        return cells
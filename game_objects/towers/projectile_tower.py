@@ -1,6 +1,7 @@
 from pygame.surface import Surface
 
 from game_objects.towers.tower_object import TowerObject
+from game_objects.entity_store import EntityStore
 from game_objects.towers.tower_type import TowerType
 
 class ProjectileTower(TowerObject):
@@ -11,16 +12,17 @@ class ProjectileTower(TowerObject):
      animation: list[Surface],damage:int,reload_time:int,
      tower_type:TowerType,
      projectile_animation:list[Surface], 
-     animation_index: int = 0, lvl:int=1
+     animation_index: int = 0, lvl:int=1,
+     store:EntityStore=None
     )->None:
 
-        TowerObject.__init__(self,x,y,width,height,image,animation,damage,reload_time,tower_type,animation_index,lvl)
+        TowerObject.__init__(self,x,y,width,height,image,animation,damage,reload_time,tower_type,animation_index,lvl,store)
 
         self.projectile_animation=projectile_animation
 
     def update(self):
         TowerObject.update(self)
 
-    def fire(self)->None:
-        pass
+    def fire(self, tick:int)->None:
+        TowerObject.fire(self, tick)
         #return a projectile with projectile animation
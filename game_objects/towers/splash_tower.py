@@ -1,6 +1,8 @@
 from pygame.surface import Surface
 from game_objects.towers.tower_type import TowerType
 from game_objects.towers.tower_object import TowerObject
+from game_objects.entity_store import EntityStore
+from config.settings.general_config import Game
 
 class SplashTower(TowerObject):
     """ Class for splash tower objects """
@@ -8,16 +10,22 @@ class SplashTower(TowerObject):
     def __init__(self, x: int, y: int, width: int, height: int, image: Surface,
      animation: list[Surface],damage:int,reload_time:int,
      tower_type:TowerType, animation_index: int = 0, lvl:int=1,
-     splash_animation:list[Surface]=[]
+     splash_animation:list[Surface]=[],
+     store:EntityStore=None
     )->None:
 
         TowerObject.__init__(self,x,y,width,height,image,animation,damage,reload_time,
-    tower_type,animation_index,lvl)
+    tower_type,animation_index,lvl,store)
         self.splash_animation=splash_animation
+        self.splash_radius=tower_type.SPLASH_RADIUS*Game.RANGE_UNIT # Pixels
+        self.freeze_ticks=getattr(tower_type, "FREEZE_TIME", 0)*Game.TICK_RATE
 
     def update(self):
         TowerObject.update(self)
 
-    def fire(self)->object:
-        pass
-        #return new splash projectile with same x,y like the tower and animation from the splash animation
+    def fire(self, tick:int)->None:
+        TowerObject.fire(self, tick)
+
+    def splash(self, x:float, y:float) -> tuple:
+        """ Area hit of the shot landing on x, y: (x, y, radius, damage, freeze ticks)"""
+        return x, y, self.splash_radius, self.damage, self.freeze_ticks
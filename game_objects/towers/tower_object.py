@@ -1,27 +1,40 @@
 from game_objects.active_object import ActiveObject
 from game_objects.immobile_object import ImmobileObject
+from game_objects.entity_store import Component, EntityStore
 
 from pygame.surface import Surface
 from pygame.sprite import Sprite
 from game_objects.towers.tower_type import TowerType
 
-import time
+from config.settings.general_config import Game
+from config.enums.targeting_policy import TargetingPolicy
+import numpy as np
 
 class TowerObject(ActiveObject,ImmobileObject):
     """ Most general class for tower objects """
 
+    COMPONENTS = {**ActiveObject.COMPONENTS, "damage": np.float64, "reload_time": np.float64, "last_fired": np.float64, "range": np.float64}
+
+    damage = Component()
+    reload_time = Component()
+    last_fired = Component()
+    range = Component() # Pixels from the tower center
+
     def __init__(self, x: int, y: int, width: int, height: int, image: Surface,
      animation: list[Surface],damage:int,reload_time:int,
      tower_type:TowerType, animation_index: int = 0, lvl:int=1,
-     
+     store:EntityStore=None
      ) -> None:
-        ActiveObject.__init__(self,x,y,width,height,image,animation,animation_index,lvl)
-        ImmobileObject.__init__(self,x,y,width,height,image)
+        # ImmobileObject adds nothing to GameObject, so initializing ActiveObject is enough
+        ActiveObject.__init__(self,x,y,width,height,image,animation,animation_index,lvl,store)
 
         self.damage=damage
         self.reload_time=reload_time
         self.tower_type=tower_type
-        self.last_fired=0
+        self.last_fired=-np.inf # Tick of the last shot
+        self.range=tower_type.RANGE*Game.RANGE_UNIT
+        self.targeting=getattr(tower_type, "TARGETING", TargetingPolicy.FIRST)
+        self.target=None # Enemy the tower shoots at, kept by ai.targeting
 
     def update(self) -> None:
         ActiveObject.update(self)
@@ -32,10 +45,12 @@ class TowerObject(ActiveObject,ImmobileObject):
         self.lvl+=1
         #change the surface and stats
 
-    def reloaded(self) -> bool:
-        return time.time() - self.last_fired >= self.reload_time
+    def reloaded(self, tick:int) -> bool:
+        """ reload_time is in seconds, tick is the game tick. No tower reloads faster than Game.TOWER_RELOAD_TIMES"""
+        reload_ticks = max(self.reload_time*Game.TICK_RATE, Game.TOWER_RELOAD_TIMES*Game.TICK_RATE/Game.FPS)
+        return tick - self.last_fired >= reload_ticks
 
-    def fire(self)->None:
+    def fire(self, tick:int)->None:
         """ Fires the coresponding projectile type to the neares enemy """
-        self.last_fired=time.time()
+        self.last_fired=tick
         
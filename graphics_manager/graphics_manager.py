@@ -1,30 +1,52 @@
 """ Graphics manager."""
 import pygame as pg #importing pygame
-import logging #importing logging
+from game_logger.game_logger import get_logger #importing project logging
+from collections import OrderedDict
 from config.settings.general_config import Window #importing Window class from config
 from config.settings.general_config import Colors #importing colors class from config
+from config.settings.general_config import Textures #importing Textures class from config
+from config.settings.enemies import enemy_types
+from config.settings.towers import tower_types
 from texture_loader.texture_loader import TextureLoader #importing texture_loader
 from game_objects.game_object import GameObject #importing GameObject
 #from config.enums.object_animation import ObjectAnimation
-logging.debug("everything imported succesfully. ")
+log = get_logger(__name__, hot=True)
+log.debug("everything imported succesfully. ")
+
+def coalesce_rects(rects: list) -> list[pg.Rect]:
+    """ Merges overlapping rects into their unions, so every pixel is updated only once."""
+    merged = []
+    for rect in rects:
+        rect = pg.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
 
 class GraphicsManager:
     def __init__(self) -> None:
         """ Graphics manager class."""
-        logging.info("GraphicsManager called.")
+        log.info("GraphicsManager called.")
         self.screen: pg.Surface = None
         self.textures: dict = {}
         self.background: pg.Surface = None
+        self.game_background: pg.Surface = None #pre-rendered static layer (tiles and towers)
         self.rects_to_update = []
+        self.overlay: pg.Surface = None #drawn over everything, used by the profiler
+        self.overlay_rect: pg.Rect = None
 
         self.canvas_game: pg.Surface = None
         self.canvas_gui: pg.Surface = None
         self.texture_loader = TextureLoader()
-        logging.debug("GraphicsManager class initializer ran succesfully.")
+        self.scaled_cache = OrderedDict() # (texture path, frame, size) -> scaled surface, least recently used first
+        log.debug("GraphicsManager class initializer ran succesfully.")
 
     def draw_object(self, object: GameObject, game:bool, background=None) -> None:
         """ Draws object.image texture on object.rect place."""
-        logging.debug(" draw_object method of GraphicsManager called succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug(" draw_object method of GraphicsManager called succesfully.")
         if not background:
             background = self.background
         if game:
@@ -33,17 +55,19 @@ class GraphicsManager:
             surface = self.canvas_gui
 
         if game:
-            self.rects_to_update.append(surface.blit(object.image, (object.rect.x, object.rect.y)))
+            self.rects_to_update.append(surface.blit(object.image, (object.rect.x, object.rect.y)).move(0, Window.GUI_HEIGHT))
         else:
             self.rects_to_update.append(surface.blit(object.image, object.rect))
 
-        logging.debug("Object drawn succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug("Object drawn succesfully.")
 
     def draw_group(self, group: pg.sprite.RenderUpdates, game:bool, background=None) -> None:
         """ Draws object.image texture on object.rect place."""
-        logging.debug(" draw_group method of GraphicsManager called succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug(" draw_group method of GraphicsManager called succesfully.")
         if background is None:
-            background = self.background
+            background = self.game_background if game else self.background
         if game:
             surface = self.canvas_game
         else:
@@ -58,11 +82,13 @@ class GraphicsManager:
         else:
             self.rects_to_update += group.draw(surface)
 
-        logging.debug("Group drawn succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug("Group drawn succesfully.")
 
     def draw_rect(self, rect: pg.Rect, color: tuple, game:bool, background=None, width=Window.CARD_RECT_WIDTH) -> None:
         """ Draws rect on screen. """
-        logging.debug(" draw_rect method of GraphicsManager called succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug(" draw_rect method of GraphicsManager called succesfully.")
         if background is None:
             background = self.background
         if game:
@@ -73,19 +99,67 @@ class GraphicsManager:
         pg.draw.rect(surface, color, rect, width)
         self.rects_to_update.append(rect)
 
-        logging.debug("Rect drawn succesfully.")
+        if __debug__ and log.debug_enabled:
+            log.debug("Rect drawn succesfully.")
+
 
+    def clear_area(self, rect: pg.Rect, game:bool, background=None) -> None:
+        """ Draws background over rect."""
+        if background is None:
+            background = self.game_background if game else self.background
+        if game:
+            self.canvas_game.blit(background, rect, rect)
+            self.rects_to_update.append(rect.move(0, Window.GUI_HEIGHT))
+        else:
+            self.canvas_gui.blit(background, rect, rect)
+            self.rects_to_update.append(pg.Rect(rect))
+
+    def bake_background(self, group: pg.sprite.Group) -> None:
+        """ Pre-renders static objects into the game background once. Moving sprites are cleared against it."""
+        log.debug("bake_background method of GraphicsManager called.")
+        self.game_background = pg.Surface((Window.GAME_WIDTH, Window.GAME_HEIGHT)).convert()
+        self.game_background.fill(Colors.BACKGROUND)
+        group.draw(self.game_background)
+        self.canvas_game.blit(self.game_background, (0, 0))
+        self.rects_to_update.append(pg.Rect(0, Window.GUI_HEIGHT, Window.GAME_WIDTH, Window.GAME_HEIGHT))
+
+    def add_static(self, object: GameObject) -> None:
+        """ Draws object into the game background, so it stays on screen without redrawing."""
+        self.game_background.blit(object.image, object.rect)
+        self.draw_object(object, True)
 
     def load_all_textures(self) -> None:
         """Initializates load_all_textures method."""
-        logging.debug("Load_all_functions called.")
+        log.debug("Load_all_functions called.")
         self.textures = self.texture_loader.load_all_textures()
 
+    def get_scaled(self, folder:str, name:str, size:tuple, frame:int=0) -> pg.Surface:
+        """ Returns frame of game object texture scaled to size. Scaled surfaces are cached"""
+        key = (("game_objects", folder, name), frame, size)
+        image = self.scaled_cache.get(key)
+        if image is not None:
+            self.scaled_cache.move_to_end(key)
+            return image
+
+        image = pg.transform.scale(self.textures["game_objects"][folder][name][frame], size)
+        self.scaled_cache[key] = image
+        if len(self.scaled_cache) > Textures.SCALED_CACHE_SIZE:
+            self.scaled_cache.popitem(last=False)
+        return image
+
+    def prebake_scaled(self, tower_sizes:list[tuple]) -> None:
+        """ Scales textures of all enemy types and of all tower types in tower_sizes ahead of time"""
+        for enemy_type in enemy_types:
+            self.get_scaled("enemies", enemy_type.IMAGE, (enemy_type.SIZE, enemy_type.SIZE))
+        for tower_type in tower_types:
+            for size in tower_sizes:
+                self.get_scaled("towers", tower_type.IMAGE, size)
+
     def init_graphics(self) -> None:
         """ Initializate graphics. """
-        logging.debug("Function init_graphics called.")
+        log.debug("Function init_graphics called.")
         self.screen = pg.display.set_mode((Window.WINDOW_WIDTH, Window.WINDOW_HEIGHT), pg.SCALED)    #creating window
-        logging.info("Window initialized succesfully.")
+        log.info("Window initialized succesfully.")
 
         self.background = pg.Surface(self.screen.get_size())       #defining background
         self.background.fill(Colors.BACKGROUND)     #filling background with colour
@@ -95,22 +169,44 @@ class GraphicsManager:
         self.canvas_gui = pg.Surface((Window.GUI_WIDTH, Window.GUI_HEIGHT))
 
 
-        logging.debug("Background created succesfully.")
-        logging.debug("Function init_graphics ran succesfully.")
+        log.debug("Background created succesfully.")
+        log.debug("Function init_graphics ran succesfully.")
 
     def update(self):
         """ Update screen. """
-        logging.debug("screen update function called.")
-        self.screen.blit(self.canvas_game, (0, Window.GUI_HEIGHT))
-        self.screen.blit(self.canvas_gui, (0,0))
-        pg.display.update(self.rects_to_update)
+        if __debug__ and log.debug_enabled:
+            log.debug("screen update function called.")
+        if self.overlay is not None:
+            # Canvas under the overlay is redrawn every frame, the overlay goes on top
+            self.rects_to_update.append(self.overlay_rect)
+        dirty_rects = coalesce_rects(self.rects_to_update)
+        self.blit_rects(dirty_rects)
+        if self.overlay is not None:
+            self.screen.blit(self.overlay, self.overlay_rect)
+        self.flip(dirty_rects)
         self.rects_to_update = []
-        logging.debug("Rects_to_update erased.")
-        logging.debug("Screen updated succesfully!")
+        if __debug__ and log.debug_enabled:
+            log.debug("Rects_to_update erased.")
+            log.debug("Screen updated succesfully!")
+
+    def blit_rects(self, dirty_rects: list) -> None:
+        """ Copies only the changed parts of the canvases to the screen. """
+        gui_area = pg.Rect(0, 0, Window.GUI_WIDTH, Window.GUI_HEIGHT)
+        game_area = pg.Rect(0, Window.GUI_HEIGHT, Window.GAME_WIDTH, Window.GAME_HEIGHT)
+        for rect in dirty_rects:
+            gui_part = rect.clip(gui_area)
+            if gui_part:
+                self.screen.blit(self.canvas_gui, gui_part, gui_part)
+            game_part = rect.clip(game_area)
+            if game_part:
+                self.screen.blit(self.canvas_game, game_part, game_part.move(0, -Window.GUI_HEIGHT))
+
+    def flip(self, dirty_rects: list) -> None:
+        pg.display.update(dirty_rects)
 
     def get_object_animation(self, object) -> list:
         """ Returns list of animations. """
-        logging.debug(" Get_object_animation function of GraphicsManager class called.")
+        log.debug(" Get_object_animation function of GraphicsManager class called.")
         objects_animations = []
         for folder1 in self.textures:
             for folder2 in self.textures[folder1]:
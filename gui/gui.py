@@ -6,7 +6,6 @@ from graphics_manager.graphics_manager import GraphicsManager
 
 from pygame import draw, display, Surface
 from pygame.sprite import RenderUpdates, Sprite
-from pygame.transform import scale
 
 
 class Gui():
@@ -28,7 +27,8 @@ class Gui():
         self.gui_width = Window.GAME_WIDTH
         self.center_for_text = (self.gui_height-self.font_size)//2
         # Tohle bude chtit algoritmus na automaticke zarovnani
-        self.stats_position = ((Window.GUI_WIDTH//2)*1.25, self.center_for_text)
+        self.stats_position = (int((Window.GUI_WIDTH//2)*1.25), self.center_for_text)
+        self.stats_spacing = self.font.size("    ")[0]
         self.pause_pos = (Window.GUI_WIDTH//2, Window.GUI_HEIGHT-10-self.font_size)
 
         self.towers_pos = []
@@ -36,9 +36,14 @@ class Gui():
 
         self.tower_cards = RenderUpdates()
 
+        # Rendered surfaces are kept and drawn again only when their content changes
+        self.stats_cache = {} # field name -> (value, rect on gui canvas)
+        self.tower_info_cache = {} # tower type -> rendered text
+
 
     def create_gui(self, lives:int, coins:int, wave:int, textures:dict):
         """ Creates the gui"""
+        self.invalidate()
         self.draw_background()
         self.show_stats(lives, coins, wave)
         self.show_towers(textures)
@@ -55,35 +60,54 @@ class Gui():
         self.graphics_manager.draw_object(background_object, False)
 
 
+    def invalidate(self):
+        """ Forgets what was drawn, so everything gets drawn again"""
+        self.stats_cache.clear()
+        self.tower_cards.empty()
+
     def create_towers_grid(self):
         """ Creates the grid of tower cards"""
+        self.towers_pos = []
+        self.tower_pos_types = []
         for tower, tower_type in enumerate(tower_types):
             position = (Window.CARD_RECT_WIDTH+tower*Window.PIXEL_SIZE*self.gui_scale+tower*Window.CARD_RECT_WIDTH, (self.gui_height-Window.PIXEL_SIZE*self.gui_scale)//2)
             self.towers_pos.append(position)
             self.tower_pos_types.append((position, tower_type))
 
     def show_stats(self, lives:int, coins:int, wave:int):
-        stats_text = self.font.render(f'Wave: {wave}    Coins: {coins}    Lives: {lives}', True, self.color, self.background_color)
-        stats_rect = stats_text.get_rect(topleft=self.stats_position)
-        stats = GameObject(stats_rect.x, stats_rect.y, stats_rect.width, stats_rect.height, stats_text)
-
-        self.graphics_manager.draw_object(stats, False, self.background)
+        """ Shows the stats. Only fields whose value or position changed are rendered and drawn"""
+        x, y = self.stats_position
+        for name, value in (("Wave", wave), ("Coins", coins), ("Lives", lives)):
+            cached = self.stats_cache.get(name)
+            if cached is None or cached[0] != value or cached[1].x != x:
+                stats_text = self.font.render(f'{name}: {value}', True, self.color, self.background_color)
+                stats_rect = stats_text.get_rect(topleft=(x, y))
+                if cached:
+                    self.graphics_manager.clear_area(cached[1], False, self.background)
+                stats = GameObject(stats_rect.x, stats_rect.y, stats_rect.width, stats_rect.height, stats_text)
+                self.graphics_manager.draw_object(stats, False, self.background)
+                cached = (value, stats_rect)
+                self.stats_cache[name] = cached
+            x = cached[1].right + self.stats_spacing
     
     def show_tower_info(self, tower_type):
-        info_text = self.small_font.render(f'{tower_type.__name__}:    Cost: {tower_type.COST}    Range: {tower_type.RANGE}    Damage: {tower_type.DAMAGE}    Reload time: {tower_type.RELOAD_TIME}                                  ', True, self.color, self.background_color)
+        info_text = self.tower_info_cache.get(tower_type)
+        if info_text is None:
+            info_text = self.small_font.render(f'{tower_type.__name__}:    Cost: {tower_type.COST}    Range: {tower_type.RANGE}    Damage: {tower_type.DAMAGE}    Reload time: {tower_type.RELOAD_TIME}                                  ', True, self.color, self.background_color)
+            self.tower_info_cache[tower_type] = info_text
         info_rect = info_text.get_rect(topleft=(10, Window.GUI_HEIGHT-self.font_size//2-5))
         info = GameObject(info_rect.x, info_rect.y, info_rect.width, info_rect.height, info_text)
 
         self.graphics_manager.draw_object(info, False, self.background)
 
     def show_towers(self, textures:dict):
-            """ Shows the towers on the screen"""
-            self.tower_cards.empty()
+            """ Shows the towers on the screen. The cards are built and drawn only once"""
+            if self.tower_cards:
+                return
             self.create_towers_grid()
             for index, tower_type in enumerate(tower_types):
                 image_name = tower_type.IMAGE
-                image = textures["game_objects"]["towers"][image_name][0]
-                image = scale(image, (self.gui_scale*Window.PIXEL_SIZE, self.gui_scale*Window.PIXEL_SIZE))
+                image = self.graphics_manager.get_scaled("towers", image_name, (self.gui_scale*Window.PIXEL_SIZE, self.gui_scale*Window.PIXEL_SIZE))
                 tower_card = GameObject(self.towers_pos[index][0],self.towers_pos[index][1], width=self.gui_scale*Window.PIXEL_SIZE, height=self.gui_scale*Window.PIXEL_SIZE, image=image)
                 self.tower_cards.add(tower_card)
             self.graphics_manager.draw_group(self.tower_cards, False, self.background)
@@ -103,7 +127,12 @@ class Gui():
         self.font_size *= size
         self.font = Font(self.path, self.font_size)
         self.gui_scale = size
+        self.stats_spacing = self.font.size("    ")[0]
+        self.tower_info_cache.clear()
+        self.invalidate()
 
     def change_color(self, color:tuple):
         """ Changes the color of the font in gui"""
         self.color = color
+        self.tower_info_cache.clear()
+        self.invalidate()
@@ -1,84 +1,130 @@
 from PIL import Image
 from config.settings.general_config import Window, Colors, Directory
+from config.enums.tile_class import TileClass
+from collections.abc import Mapping
+import numpy as np
 import pygame as pg
 import os
-import logging
+from game_logger.game_logger import get_logger
+
+log = get_logger(__name__)
+
+#Color of every tile class in level images
+TILE_COLORS = {
+    TileClass.FREE_TILE: Colors.BACKGROUND,
+    TileClass.PATH: Colors.PATH,
+    TileClass.START: Colors.START,
+    TileClass.END: Colors.END,
+    TileClass.WALL: Colors.WALLS_HORIZONTAL,
+    TileClass.SPECIAL_WALL: Colors.WALLS_VERTICAL,
+}
+
+#Name of every tile class in the converted level
+TILE_NAMES = {
+    TileClass.PATH: "path",
+    TileClass.WALL: "walls",
+    TileClass.START: "start",
+    TileClass.END: "end",
+    TileClass.FREE_TILE: "free_tile",
+    TileClass.SPECIAL_WALL: "special_wall",
+}
+
+def level_image_path(level_difficulty: int) -> str:
+    return os.path.join(Directory.ASSETS_DIR, "level_maps", f'level_{level_difficulty}.png')
 
 #Load image
 def load_image(level_difficulty: int):
     """Load level image"""
     try:
-        logging.debug(f"Loading level {level_difficulty}")
-        level = Image.open(os.path.join(Directory.ASSETS_DIR, "level_maps", f'level_{level_difficulty}.png'))
+        log.debug("Loading level %s", level_difficulty)
+        level = Image.open(level_image_path(level_difficulty))
     except FileNotFoundError:
-        logging.error(f"Level {level_difficulty} not found")
+        log.error("Level %s not found", level_difficulty)
         raise FileNotFoundError
     return level
 
 
-#Create rect
-def create_rect(position: tuple)-> pg.Rect:
-    """Create a rect from a color and a position"""
-    try:
-        return pg.Rect(position[0], position[1], Window.PIXEL_SIZE, Window.PIXEL_SIZE)
-    except pg.error as e:
-        logging.error(f"Level converter -> create_rect(): Cannot create rect from {position}. Error: {e}")
+def pack_colors(colors: np.ndarray) -> np.ndarray:
+    """Pack RGB triples of the last axis into single 24 bit integers"""
+    colors = colors.astype(np.uint32)
+    return colors[..., 0] << 16 | colors[..., 1] << 8 | colors[..., 2]
+
+#Packed colors sorted for searchsorted and the tile class of each
+KNOWN_COLORS = pack_colors(np.array(list(TILE_COLORS.values())))
+COLOR_ORDER = np.argsort(KNOWN_COLORS)
+KNOWN_COLORS = KNOWN_COLORS[COLOR_ORDER]
+KNOWN_CLASSES = np.array(list(TILE_COLORS), dtype=np.uint8)[COLOR_ORDER]
+
+def image_to_grid(image: Image) -> np.ndarray:
+    """Convert level image into tile class grid with one vectorized lookup"""
+    pixels = pack_colors(np.asarray(image.convert("RGB")))
+    indices = np.searchsorted(KNOWN_COLORS, pixels).clip(0, len(KNOWN_COLORS)-1)
+    known = KNOWN_COLORS[indices] == pixels
+    if not known.all():
+        log.error("Level converter: %s pixels of unknown color, used as free tiles", np.count_nonzero(~known))
+    return np.where(known, KNOWN_CLASSES[indices], TileClass.FREE_TILE).astype(np.uint8)
+
+
+def grid_to_image(grid: np.ndarray) -> Image:
+    """Convert tile class grid into level image"""
+    palette = np.array([TILE_COLORS[tile_class] for tile_class in TileClass], dtype=np.uint8)
+    return Image.fromarray(palette[grid], "RGB")
+
+
+def save_level_image(grid: np.ndarray, level_difficulty: int) -> None:
+    """Export level as image into level_maps"""
+    grid_to_image(grid).save(level_image_path(level_difficulty))
 
 
-def convert_level(level_difficulty: int)-> dict:
-    """Convert level image into pygame"""
+def load_level_grid(level_difficulty: int) -> np.ndarray:
+    """Load tile class grid from level image"""
+    return image_to_grid(load_image(level_difficulty))
+
+
+class ConvertedLevel(Mapping):
+    """Level converted for pygame. Maps tile names to lists of rects like a dict.
+    Tile positions are kept as arrays, rects are created only when a tile name is first accessed"""
+
+    def __init__(self, grid: np.ndarray) -> None:
+        self.grid = grid
+        height, width = grid.shape
+        cells = grid.ravel()
+        # Stable sort keeps tiles of every class in row-major order
+        order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=len(TileClass))
+        self._coords = {}
+        for tile_class, indices in zip(TileClass, np.split(order, np.cumsum(counts)[:-1])):
+            self._coords[TILE_NAMES[tile_class]] = np.column_stack((indices % width, indices // width)) * Window.PIXEL_SIZE
+        self._rects = {}
+
+    def coords(self, name: str) -> np.ndarray:
+        """Pixel positions (x, y) of all tiles with the name"""
+        return self._coords[name]
+
+    def __getitem__(self, name: str) -> list[pg.Rect]:
+        rects = self._rects.get(name)
+        if rects is None:
+            size = Window.PIXEL_SIZE
+            rects = [pg.Rect(x, y, size, size) for x, y in self._coords[name].tolist()]
+            self._rects[name] = rects
+        return rects
+
+    def __iter__(self):
+        return iter(TILE_NAMES.values())
+
+    def __len__(self) -> int:
+        return len(TILE_NAMES)
+
+
+def convert_level(level_difficulty: int, grid: np.ndarray = None)-> ConvertedLevel:
+    """Convert level into pygame. Without grid the level is loaded from its image"""
 
     #Get data from level generator's image
-    try:
-        pixels = list(load_image(level_difficulty).getdata())
-    except Exception as e:
-        logging.error(f"Level converter -> convert_level(): Cannot load image. Error: {e}")
-        raise e
-
-    path_rect = []
-    walls_rect = []
-    start_rect = []
-    end_rect = []
-    free_tile_rect = []
-    special_wall_rect = []
-
-    tiles = {
-        "path": path_rect,
-        "walls": walls_rect,
-        "start": start_rect,
-        "end": end_rect,
-        "free_tile": free_tile_rect,
-        "special_wall" : special_wall_rect
-    }
-
-    #Process data from image
-    for i, pixel in enumerate(pixels):
-        x = i%Window.TILES_IN_WIDTH*Window.PIXEL_SIZE
-        y = i//Window.TILES_IN_WIDTH*Window.PIXEL_SIZE
-
-        
-        #Detect colors
-        if pixel == Colors.WALLS_HORIZONTAL:
-            square = create_rect((x, y))
-            walls_rect.append(square)
-        elif pixel == Colors.PATH:
-            square = create_rect((x, y))
-            path_rect.append(square)
-        elif pixel == Colors.START:
-            square = create_rect((x, y))
-            start_rect.append(square)
-        elif pixel == Colors.END:
-            square = create_rect((x, y))
-            end_rect.append(square)
-        elif pixel == Colors.BACKGROUND:
-            square = create_rect((x, y))
-            free_tile_rect.append(square)
-        elif pixel == Colors.WALLS_VERTICAL:
-            square = create_rect((x, y))
-            special_wall_rect.append(square)
-        else:
-            logging.error(f"Level converter: Unknown color: {pixel}")
-            print("Unknown color")
-
-
-    return tiles
\ No newline at end of file
+    if grid is None:
+        try:
+            grid = load_level_grid(level_difficulty)
+        except Exception as e:
+            log.error("Level converter -> convert_level(): Cannot load image. Error: %s", e)
+            raise e
+
+    return ConvertedLevel(grid)
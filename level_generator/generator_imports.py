@@ -1,6 +1,7 @@
 from enum import Enum
 import random
-from PIL import Image
+import numpy as np
 
 from config.settings.general_config import Colors
+from config.enums.tile_class import TileClass
 from config.settings.level_generator_config import *
\ No newline at end of file
@@ -1,5 +1,6 @@
 """Avek sa kan dan la man"""
 from level_generator.generator_imports import *
+from level_converter.level_converter import save_level_image
 
 class Direction(Enum):
     """Class that contains Direction vectors"""
@@ -60,31 +61,28 @@ def pref_directions(start_point:tuple[int]) -> list[Direction]:
 
     return pref_directions
 
-def draw_point(x:int, y:int, img:Image)->None:
-    """Create 1 point on a specific pixel on the image"""
-    img.putpixel((x, y), Colors.PATH)
+def draw_point(x:int, y:int, grid:np.ndarray)->None:
+    """Create 1 point on a specific tile of the grid"""
+    grid[y, x] = TileClass.PATH
 
-def draw_start(x:int, y:int, img:Image)->None:
+def draw_start(x:int, y:int, grid:np.ndarray)->None:
     """Draw start point"""
-    img.putpixel((x, y), Colors.START)
-
-def draw_end(x:int, y:int, img:Image)->None:
-    """Create 1 point on a specific pixel on the image"""
-    img.putpixel((x, y), Colors.END)
-
-def my_random_direction(probability:dict) -> Direction:
-    """Return a random direction based on probabilities"""
-    vectors_probability = []
-    for i in range(probability[Direction.UP.value]):
-        vectors_probability.append(Direction.UP)
-    for i in range(probability[Direction.DOWN.value]):
-        vectors_probability.append(Direction.DOWN)
-    for i in range(probability[Direction.RIGHT.value]):
-        vectors_probability.append(Direction.RIGHT)
-    for i in range(probability[Direction.LEFT.value]):
-        vectors_probability.append(Direction.LEFT)
-    
-    return random.choice(vectors_probability)
+    grid[y, x] = TileClass.START
+
+def draw_end(x:int, y:int, grid:np.ndarray)->None:
+    """Create 1 point on a specific tile of the grid"""
+    grid[y, x] = TileClass.END
+
+#Order of directions in the cumulative weight table
+SAMPLING_ORDER = (Direction.UP, Direction.DOWN, Direction.RIGHT, Direction.LEFT)
+
+def my_random_direction(probability:dict, rng:random.Random=random) -> Direction:
+    """Return a random direction based on probabilities. Samples one number from the cumulative weights"""
+    roll = rng.randrange(sum(max(probability[direction.value], 0) for direction in SAMPLING_ORDER))
+    for direction in SAMPLING_ORDER:
+        roll -= max(probability[direction.value], 0)
+        if roll < 0:
+            return direction
 
 def move_to(rnd_direction:Direction, x:int, y:int) -> tuple:
     """Change x, y to a new value based on the Direction"""
@@ -106,8 +104,8 @@ def end_points(start_point:tuple)->list[tuple]:
 def legal_move(x:int, y:int):
     return 0<=x<Window.TILES_IN_WIDTH and 0<=y<Window.TILES_IN_HEIGHT
 
-def generate_level(lvl:int):
-    """Generate a level"""
+def draw_level(lvl:int, grid:np.ndarray, rng:random.Random=random) -> np.ndarray:
+    """Draw a level into the grid buffer using rng for every random choice"""
 
     prob_decrease, min_straight_line, max_prob = Config_lvl_gen.PROBS[lvl]
 
@@ -118,15 +116,15 @@ def generate_level(lvl:int):
         Direction.RIGHT.value: 250
     }
 
-    img = Image.new('RGB', (Window.TILES_IN_WIDTH, Window.TILES_IN_HEIGHT), color = Colors.BACKGROUND)
+    grid.fill(TileClass.FREE_TILE)
 
     #Vytvoří random start na random ose a pak vybere 1 start 
-    start_osa_1 = 0, random.randint(5, Window.TILES_IN_HEIGHT-5)
-    start_osa_2 = random.randint(5, Window.TILES_IN_WIDTH-5), 0
-    start_osa_3 = Window.TILES_IN_WIDTH-1, random.randint(5, Window.TILES_IN_HEIGHT-5)
-    start_osa_4 = random.randint(5, Window.TILES_IN_WIDTH-5), Window.TILES_IN_HEIGHT-1
+    start_osa_1 = 0, rng.randint(5, Window.TILES_IN_HEIGHT-5)
+    start_osa_2 = rng.randint(5, Window.TILES_IN_WIDTH-5), 0
+    start_osa_3 = Window.TILES_IN_WIDTH-1, rng.randint(5, Window.TILES_IN_HEIGHT-5)
+    start_osa_4 = rng.randint(5, Window.TILES_IN_WIDTH-5), Window.TILES_IN_HEIGHT-1
     #Vybraný start
-    chosen_start = random.choice([start_osa_1, start_osa_2, start_osa_3, start_osa_4])
+    chosen_start = rng.choice([start_osa_1, start_osa_2, start_osa_3, start_osa_4])
 
     # Define the border pixels
     #border_pixels = set(
@@ -146,24 +144,24 @@ def generate_level(lvl:int):
 
     #Posunese o pixel dál
     x, y = x+first_direction_1.value[0], y+first_direction_1.value[1]
-    draw_point(x, y, img)
+    draw_point(x, y, grid)
     last_direction = first_direction_1
 
     pref_directions_1 = pref_directions(chosen_start)
 
-    end_points_1 = end_points(chosen_start)
+    end_points_1 = set(end_points(chosen_start))
     counter = 0 #Počet kroků rovně
 
     while (x, y) not in end_points_1:
 
-        direction = my_random_direction(probability)
+        direction = my_random_direction(probability, rng)
         while not legal_move(*move_to(direction, x, y)):
-            direction = my_random_direction(probability)
+            direction = my_random_direction(probability, rng)
             if probability[direction.value] == max_prob:
                 update_probs(probability, direction, pref_directions_1, prob_decrease)
             
         x, y = move_to(direction, x, y)
-        draw_point(x, y, img)
+        draw_point(x, y, grid)
 
         if direction == last_direction:
             if counter > min_straight_line:
@@ -176,11 +174,29 @@ def generate_level(lvl:int):
             counter = 0
 
     #Nakreslí konec
-    draw_end(x, y, img)
+    draw_end(x, y, grid)
 
     x, y = chosen_start
     #Nakreslí start
-    draw_start(*chosen_start, img)
+    draw_start(*chosen_start, grid)
+
+    return grid
+
+def generate_level(lvl:int, save:bool=False, seed:int=None) -> np.ndarray:
+    """Generate a level. Returns tile class grid, with save it is also exported as level image.
+    With seed the level is reproducible, without it the global random state is used"""
+    rng = random if seed is None else random.Random(seed)
+    grid = np.empty((Window.TILES_IN_HEIGHT, Window.TILES_IN_WIDTH), dtype=np.uint8)
+    draw_level(lvl, grid, rng)
 
     # Save the image
-    img.save(f"assets/level_maps/level_{lvl}.png")
\ No newline at end of file
+    if save:
+        save_level_image(grid, lvl)
+    return grid
+
+def generate_levels(lvl:int, seeds:list[int]) -> np.ndarray:
+    """Generate a batch of seeded levels into one (len(seeds), height, width) array"""
+    grids = np.empty((len(seeds), Window.TILES_IN_HEIGHT, Window.TILES_IN_WIDTH), dtype=np.uint8)
+    for grid, seed in zip(grids, seeds):
+        draw_level(lvl, grid, random.Random(seed))
+    return grids
\ No newline at end of file
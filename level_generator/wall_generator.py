@@ -1,128 +1,69 @@
-from PIL import Image
-from config.settings.general_config import Colors
+import random
+import numpy as np
+from config.enums.tile_class import TileClass
 from config.settings.general_config import Window
 from config.settings.wall_generator_config import *
-from random import randint
+from level_converter.level_converter import load_level_grid, save_level_image
+from game_logger.game_logger import get_logger
+
+log = get_logger(__name__)
+
+BLOCKING = (TileClass.PATH, TileClass.START, TileClass.END)
+WALLS = (TileClass.WALL, TileClass.SPECIAL_WALL)
+
+class WallGenerationError(Exception):
+    """Raised when not all walls of a level fit into the attempt budget"""
+
+def wall_slices(x_one:int, y_one:int, x_two:int, y_two:int) -> tuple[tuple, tuple]:
+    """Returns grid slices of the vertical and horizontal part of a wall.
+    The vertical part goes from (x_one, y_one) to y_two, the horizontal one from x_one to x_two"""
+    vertical = (slice(min(y_one, y_two), max(y_one, y_two)+1), x_one)
+    if x_two >= x_one:
+        horizontal = (y_one, slice(x_one+1, x_two+1))
+    else:
+        horizontal = (y_one, slice(x_two, x_one))
+    return vertical, horizontal
+
+def generate_walls(grid: np.ndarray, lvl: int, rng:random.Random=random, strict:bool=False) -> int:
+    """Draws walls into the tile class grid. Returns how many walls were placed.
+    Gives up after MAX_WALL_ATTEMPTS candidates, with strict it then raises WallGenerationError"""
+    blocked = np.isin(grid, BLOCKING)
+    walls = np.isin(grid, WALLS)
+    required = NUMBER_OF_WALLS_DICTIONARY[lvl]
+    placed = 0
+    attempts = 0
+
+    while placed < required and attempts < MAX_WALL_ATTEMPTS:
+        attempts += 1
+        x_one = rng.randint(0, Window.TILES_IN_WIDTH - 1)
+        y_one = rng.randint(0, Window.TILES_IN_HEIGHT - 1)
+
+        x_two = rng.randint(0, Window.TILES_IN_WIDTH - 1)
+        y_two = rng.randint(0, Window.TILES_IN_HEIGHT - 1)
+
+        if abs(x_two - x_one) + abs(y_two - y_one) < MINIMUM_LENGTH_OF_WALLS:
+            continue
+
+        vertical, horizontal = wall_slices(x_one, y_one, x_two, y_two)
+        # Walls must not cross the path or other walls
+        if blocked[vertical].any() or blocked[horizontal].any() or walls[vertical].any() or walls[horizontal].any():
+            continue
+
+        grid[vertical] = TileClass.SPECIAL_WALL
+        grid[horizontal] = TileClass.WALL
+        walls[vertical] = True
+        walls[horizontal] = True
+        placed += 1
+
+    if placed < required:
+        message = f"Placed {placed} of {required} walls for level {lvl} in {attempts} attempts"
+        if strict:
+            raise WallGenerationError(message)
+        log.warning(message)
+    return placed
 
-def load_image(lvl):
-    img = Image.open(f"assets/level_maps/level_{lvl}.png")
-    return img
-    
-def draw_point_vertical(x:int, y:int, img:Image)->None:
-    """Create 1 point on a specific pixel on the image"""
-    img.putpixel((x, y), Colors.WALLS_VERTICAL)
-
-def draw_point_horizontal(x:int, y:int, img:Image)->None:
-    """Create 1 point on a specific pixel on the image"""
-    img.putpixel((x, y), Colors.WALLS_HORIZONTAL)
-
-def save_image(img: Image, lvl: int):
-    img.save(f"assets/level_maps/level_{lvl}.png")
-
-def convert_to_array(img: Image) -> list:
-
-    converted_image = [
-        [None for _ in range(50)]
-        for _ in range(60)
-    ]
-    img_data = list(img.getdata())
-    for index, color in enumerate(img_data):
-        converted_image[index % 60][index // 60] = color
-
-    return converted_image
-
-def generate_walls(img: Image, lvl: int):
-    converted_image = convert_to_array(img)
-    points_to_draw_vertical = []
-    points_to_draw_horizontal = []
-    walls_vertical = []
-    walls_horizontal = []
-
-    while len(walls_horizontal) < NUMBER_OF_WALLS_DICTIONARY[lvl]:
-        x_one = randint(0, Window.PIXEL_SIZE - 1)
-        y_one = randint(0, Window.PIXEL_SIZE - 1)
-
-        x_two = randint(0, Window.TILES_IN_WIDTH - 1)
-        y_two = randint(0, Window.TILES_IN_HEIGHT - 1)
-        
-        y = y_one
-        x = x_one
-        trash_wall = False
-
-        wall_length = 0
-
-        while y < y_two:
-            y += 1
-            wall_length += 1
-            if converted_image[x_one][y] == Colors.PATH or converted_image[x_one][y] == Colors.START or converted_image[x_one][y] == Colors.END:
-                trash_wall = True
-                y = y_one
-                wall_length = 0
-                break
-            points_to_draw_vertical.append((x_one, y))
-
-
-        while y > y_two:
-            y -= 1
-            wall_length += 1
-            if converted_image[x_one][y] == Colors.PATH or converted_image[x_one][y] == Colors.START or converted_image[x_one][y] == Colors.END:
-                trash_wall = True
-                y = y_one
-                wall_length = 0
-                break
-            points_to_draw_vertical.append((x_one, y))
-
-
-        while x < x_two:
-            x += 1
-            wall_length += 1
-            if converted_image[x][y_one] == Colors.PATH or converted_image[x][y_one] == Colors.START or converted_image[x][y_one] == Colors.END:
-                trash_wall = True
-                x = x_one
-                wall_length = 0
-                break
-            points_to_draw_horizontal.append((x, y_one))
-
-
-        while x > x_two:
-            x -= 1
-            wall_length += 1
-            if converted_image[x][y_one] == Colors.PATH or converted_image[x][y_one] == Colors.START or converted_image[x][y_one] == Colors.END:
-                trash_wall = True
-                x = x_one
-                wall_length = 0
-                break
-            points_to_draw_horizontal.append((x, y_one))
-
-        if converted_image[x_one][y_one] == Colors.PATH or converted_image[x_one][y_one] == Colors.START or converted_image[x_one][y_one] == Colors.END:
-            trash_wall = True
-
-        points_to_draw_vertical.append((x_one, y_one))
-
-        if wall_length < MINIMUM_LENGTH_OF_WALLS:
-            trash_wall = True
-
-        if converted_image[x_one][y_one] == Colors.WALLS_VERTICAL and converted_image[x_two][y_two] == Colors.WALLS_VERTICAL or Colors.WALLS_HORIZONTAL and converted_image[x_two][y_two] == Colors.WALLS_HORIZONTAL:
-            trash_wall = True
-
-        if not trash_wall:
-            walls_vertical.append(points_to_draw_vertical.copy())
-            walls_horizontal.append(points_to_draw_horizontal.copy())
-        points_to_draw_horizontal = []
-        points_to_draw_vertical = []
-
-    for wall in walls_vertical:
-        for point in wall:
-            draw_point_vertical(point[0], point[1], img)
-
-    for wall in walls_horizontal:
-        for point in wall:
-            draw_point_horizontal(point[0], point[1], img)
-    
-
-
-    
 def create_walls(lvl: int):
-    image = load_image(lvl)
-    generate_walls(image, lvl)
-    save_image(image, lvl)
\ No newline at end of file
+    """Adds walls to the saved level image"""
+    grid = load_level_grid(lvl)
+    generate_walls(grid, lvl)
+    save_level_image(grid, lvl)
@@ -0,0 +1,142 @@
+""" Persistent level cache. Generated levels are saved as fixed layout binary files keyed by (level, seed)
+and memory-mapped on load, so every process playing the same map shares its pages"""
+import os
+import random
+
+import numpy as np
+
+from ai.path_graph import PathGraph, Route
+from config.enums.tile_class import TileClass
+from config.settings.general_config import Directory, Window
+from game_logger.game_logger import get_logger
+from level_converter.level_converter import ConvertedLevel
+from level_generator.level_generator import draw_level
+from level_generator.wall_generator import generate_walls
+
+log = get_logger(__name__)
+
+MAGIC = b"TDLV"
+LEVEL_STORE_VERSION = 1
+ALIGNMENT = 8
+
+# File layout: header, tile class grid (height, width) uint8, wall tiles (walls, 2) int16,
+# route offsets (routes+1) int32, route tiles (route_tiles, 2) int16. Every section starts aligned to 8 bytes
+HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("level", "<i4"),
+    ("height", "<u4"),
+    ("width", "<u4"),
+    ("walls", "<u4"),
+    ("routes", "<u4"),
+    ("route_tiles", "<u4"),
+    ("seed", "<i8"),
+    ("start", "<i4", 2),
+    ("end", "<i4", 2),
+])
+
+
+def aligned(size:int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+class StoredLevel:
+    """ Level with everything derived from it. Arrays are read only views into the mapped file"""
+
+    def __init__(self, level:int, seed:int, grid:np.ndarray, walls:np.ndarray, start:tuple, end:tuple, routes:list[Route]) -> None:
+        self.level = level
+        self.seed = seed
+        self.grid = grid # (height, width) tile classes
+        self.walls = walls # (x, y) of every wall tile
+        self.start = start # (x, y) tile
+        self.end = end # (x, y) tile
+        self.routes = routes
+
+
+def build_level(level:int, seed:int) -> tuple[np.ndarray, list[Route]]:
+    """ Generates the level with its walls from the seed and finds its routes"""
+    rng = random.Random(seed)
+    grid = np.empty((Window.TILES_IN_HEIGHT, Window.TILES_IN_WIDTH), dtype=np.uint8)
+    draw_level(level, grid, rng)
+    generate_walls(grid, level, rng)
+    return grid, PathGraph(ConvertedLevel(grid)).routes()
+
+
+class LevelStore:
+    """ Directory of level files, one file per (level, seed)"""
+
+    def __init__(self, cache_dir:str=None) -> None:
+        self.cache_dir = cache_dir or Directory.LEVEL_CACHE_DIR
+
+    def path(self, level:int, seed:int) -> str:
+        return os.path.join(self.cache_dir, f"level_{level}_{seed}.bin")
+
+    def save(self, level:int, seed:int, grid:np.ndarray, routes:list[Route]) -> None:
+        """ Writes the level file. The file is written under a temporary name and then renamed,
+        so other processes never map a half written file"""
+        walls = np.argwhere(np.isin(grid, (TileClass.WALL, TileClass.SPECIAL_WALL)))[:, ::-1].astype("<i2")
+        offsets = np.cumsum([0] + [len(route.tiles) for route in routes]).astype("<i4")
+        route_tiles = np.array([tile for route in routes for tile in route.tiles], dtype="<i2").reshape(-1, 2)
+
+        header = np.zeros(1, dtype=HEADER)
+        header["magic"] = MAGIC
+        header["version"] = LEVEL_STORE_VERSION
+        header["level"] = level
+        header["seed"] = seed
+        header["height"], header["width"] = grid.shape
+        header["walls"] = len(walls)
+        header["routes"] = len(routes)
+        header["route_tiles"] = len(route_tiles)
+        header["start"] = np.argwhere(grid == TileClass.START)[0, ::-1]
+        header["end"] = np.argwhere(grid == TileClass.END)[0, ::-1]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(level, seed)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            for section in (header, grid.astype(np.uint8), walls, offsets, route_tiles):
+                data = np.ascontiguousarray(section).tobytes()
+                file.write(data)
+                file.write(bytes(aligned(len(data)) - len(data)))
+        os.replace(temporary, path)
+
+    def load(self, level:int, seed:int) -> StoredLevel:
+        """ Maps the level file. Returns None when the file is missing or was written by another version"""
+        try:
+            data = np.memmap(self.path(level, seed), dtype=np.uint8, mode="r")
+        except (OSError, ValueError):
+            return None
+        if len(data) < HEADER.itemsize:
+            return None
+        header = data[:HEADER.itemsize].view(HEADER)[0]
+        if header["magic"] != MAGIC or header["version"] != LEVEL_STORE_VERSION \
+                or header["level"] != level or header["seed"] != seed:
+            log.warning("Level store: %s is stale, it will be rebuilt", self.path(level, seed))
+            return None
+
+        offset = HEADER.itemsize
+        sections = []
+        for dtype, shape in ((np.uint8, (header["height"], header["width"])),
+                             ("<i2", (header["walls"], 2)),
+                             ("<i4", (header["routes"] + 1,)),
+                             ("<i2", (header["route_tiles"], 2))):
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if offset + size > len(data):
+                log.warning("Level store: %s is truncated, it will be rebuilt", self.path(level, seed))
+                return None
+            sections.append(data[offset:offset+size].view(dtype).reshape(shape))
+            offset += aligned(size)
+        grid, walls, offsets, route_tiles = sections
+
+        routes = [Route([tuple(tile) for tile in route_tiles[begin:end].tolist()])
+                  for begin, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        return StoredLevel(level, seed, grid, walls, tuple(header["start"].tolist()), tuple(header["end"].tolist()), routes)
+
+    def get(self, level:int, seed:int) -> StoredLevel:
+        """ Returns the stored level, on first use it is generated and saved"""
+        stored = self.load(level, seed)
+        if stored is None:
+            log.info("Level store: generating level %s with seed %s", level, seed)
+            self.save(level, seed, *build_level(level, seed))
+            stored = self.load(level, seed)
+        return stored
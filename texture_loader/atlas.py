@@ -0,0 +1,150 @@
+""" Texture atlas. Packs all game object textures into a few sheets cached on disk."""
+import hashlib
+import json
+import os
+
+import pygame as pg
+
+from config.settings.general_config import Directory, Textures
+from game_logger.game_logger import get_logger
+
+log = get_logger(__name__)
+
+ATLAS_VERSION = 1
+
+
+def collect_sources(assets_path: str) -> list[tuple]:
+    """ Returns (folder, sub_folder, textures, file name, path, stat) of every texture, sorted."""
+    sources = []
+    for folder in sorted(os.scandir(assets_path), key=lambda entry: entry.name):
+        if folder.name in Directory.EXCLUDED_DIRS or not folder.is_dir():
+            continue
+        for sub_folder in sorted(os.scandir(folder.path), key=lambda entry: entry.name):
+            if not sub_folder.is_dir():
+                continue
+            for textures in sorted(os.scandir(sub_folder.path), key=lambda entry: entry.name):
+                if not textures.is_dir():
+                    continue
+                for texture in sorted(os.scandir(textures.path), key=lambda entry: entry.name):
+                    if texture.is_file():
+                        sources.append((folder.name, sub_folder.name, textures.name, texture.name, texture.path, texture.stat()))
+    return sources
+
+
+def sources_key(sources: list[tuple]) -> str:
+    """ Hash of texture paths, sizes and modification times. Changes whenever a texture changes."""
+    digest = hashlib.sha1(f"{ATLAS_VERSION}:{Textures.ATLAS_SIZE}".encode())
+    for folder, sub_folder, textures, name, path, stat in sources:
+        digest.update(f"{folder}/{sub_folder}/{textures}/{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def pack(sizes: list[tuple], sheet_size: int) -> list[tuple]:
+    """ Shelf packing. Returns (sheet, x, y) for every size, tallest images are placed first."""
+    order = sorted(range(len(sizes)), key=lambda index: sizes[index][1], reverse=True)
+    places = [None] * len(sizes)
+    sheet, x, y, shelf_height = 0, 0, 0, 0
+    for index in order:
+        width, height = sizes[index]
+        if width > sheet_size or height > sheet_size:
+            raise ValueError(f"Texture {width}x{height} does not fit into atlas sheet {sheet_size}x{sheet_size}")
+        if x + width > sheet_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > sheet_size:
+            sheet, x, y, shelf_height = sheet + 1, 0, 0, 0
+        places[index] = (sheet, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return places
+
+
+class TextureAtlas:
+    """ Texture sheets plus an index of where every texture is."""
+
+    def __init__(self, cache_dir: str = None) -> None:
+        self.cache_dir = cache_dir or Directory.CACHE_DIR
+        self.index_path = os.path.join(self.cache_dir, "atlas.json")
+        self.data_path = os.path.join(self.cache_dir, "atlas.bin")
+
+    def build(self, sources: list[tuple], key: str) -> tuple[list, list]:
+        """ Loads every texture, packs them into sheets and writes the cache. Returns sheets and entries."""
+        log.info("Building texture atlas.")
+        images = []
+        for source in sources:
+            try:
+                images.append(pg.image.load(source[4]))
+            except Exception as e:
+                log.error("Failed to load %s: %s", source[4], e)
+                raise
+
+        places = pack([image.get_size() for image in images], Textures.ATLAS_SIZE)
+        sheet_heights = {}
+        for image, (sheet, x, y) in zip(images, places):
+            sheet_heights[sheet] = max(sheet_heights.get(sheet, 0), y + image.get_height())
+
+        sheets = [pg.Surface((Textures.ATLAS_SIZE, sheet_heights[sheet])) for sheet in range(len(sheet_heights))]
+        entries = []
+        for source, image, (sheet, x, y) in zip(sources, images, places):
+            sheets[sheet].blit(image, (x, y))
+            entries.append({"path": list(source[:4]), "sheet": sheet, "rect": [x, y, *image.get_size()]})
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Both files are written under temporary names and renamed, the data first.
+        # The key appears only when the data is complete, processes starting at once never read a half written cache
+        temporary = f"{self.data_path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as data:
+            for sheet in sheets:
+                data.write(pg.image.tobytes(sheet, "RGB"))
+        os.replace(temporary, self.data_path)
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as index:
+            json.dump({"key": key, "sheets": [sheet.get_size() for sheet in sheets], "entries": entries}, index)
+        os.replace(temporary, self.index_path)
+        return sheets, entries
+
+    def load(self, key: str) -> tuple[list, list]:
+        """ Reads sheets and entries from the cache. Returns None when the cache is missing, stale or truncated."""
+        try:
+            with open(self.index_path) as index:
+                meta = json.load(index)
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+
+        try:
+            with open(self.data_path, "rb") as data:
+                buffer = data.read()
+        except OSError:
+            return None
+        if len(buffer) != sum(width*height*3 for width, height in meta["sheets"]):
+            log.warning("Texture atlas data does not match its index, it will be rebuilt.")
+            return None
+        sheets = []
+        offset = 0
+        for width, height in meta["sheets"]:
+            size = width*height*3
+            sheets.append(pg.image.frombytes(buffer[offset:offset+size], (width, height), "RGB"))
+            offset += size
+        return sheets, meta["entries"]
+
+    def load_textures(self, assets_path: str) -> dict:
+        """ Returns textures sorted by folders like TextureLoader does. Uses the cache when it is up to date."""
+        sources = collect_sources(assets_path)
+        key = sources_key(sources)
+        cached = self.load(key)
+        if cached is None:
+            cached = self.build(sources, key)
+        else:
+            log.info("Texture atlas loaded from cache.")
+        sheets, entries = cached
+
+        if pg.display.get_surface() is not None:
+            sheets = [sheet.convert() for sheet in sheets]
+
+        texture_dict = {}
+        for entry in entries:
+            folder, sub_folder, textures, _ = entry["path"]
+            frames = texture_dict.setdefault(folder, {}).setdefault(sub_folder, {}).setdefault(textures, [])
+            frames.append(sheets[entry["sheet"]].subsurface(pg.Rect(entry["rect"])))
+        return texture_dict